@@ -0,0 +1,230 @@
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from data_cache import read_csv_cached, to_categorical
+from utils import (
+    transform_spending_df,
+    get_scatter_df,
+    create_country_group,
+    make_region_avg_df,
+    add_binned_columns,
+    add_kmeans_clusters,
+)
+
+###################
+### Definitions ###
+###################
+
+cwd = os.path.dirname(os.path.abspath(__file__))
+PANEL_PATH = cwd + "/data/spending_and_gdp_per_capita.csv"
+BASELINE_PATH = os.path.join(cwd, "benchmark_baseline.json")
+### (country factor, year factor) the real panel is scaled by
+SCALES = {
+    "real": (1, 1),
+    "countries x10": (10, 1),
+    "countries x100": (100, 1),
+    "years x10": (1, 10),
+    "years x100": (1, 100),
+}
+G7_COUNTRIES = [
+    "United States",
+    "Japan",
+    "Germany",
+    "France",
+    "United Kingdom",
+    "Canada",
+    "Italy",
+]
+BIN_GROUPS = {
+    0.0: [0.0, 5.0],
+    10.0: [5.0, 15.0],
+    20.0: [15.0, 25.0],
+    30.0: [25.0, 35.0],
+    40.0: [35.0, 45.0],
+    50.0: [45.0, 50.0],
+}
+### A case regresses when its time or peak memory grows by more than this,
+### and by more than the noise floor
+TOLERANCE = 0.25
+NOISE_FLOOR = {"seconds": 0.01, "peak_mb": 1.0}
+
+#################
+### Functions ###
+#################
+
+
+def make_panel(country_factor: int = 1, year_factor: int = 1) -> tuple:
+    """The real spending panel scaled up, and its [first, last] year range.
+
+    Every country gets country_factor - 1 renamed copies with noisy values,
+    and every series is repeated year_factor - 1 times further back in
+    time, so the gaps and duplicates of the real data scale with it.
+    """
+    real_df = read_csv_cached(PANEL_PATH).drop(columns=["Unnamed: 0"])
+    real_df = real_df.astype(
+        {col: object for col in ["Country", "Region", "Subregion"]}
+    )
+    span = int(real_df["Year"].max() - real_df["Year"].min() + 1)
+    rng = np.random.default_rng(37)
+
+    copies = []
+    for country_copy in range(country_factor):
+        for year_copy in range(year_factor):
+            df = real_df.copy()
+            df["Year"] = df["Year"] - year_copy * span
+            if country_copy:
+                df["Country"] = df["Country"] + " {0}".format(country_copy)
+                for col in [
+                    "GDP per capita (OWiD)",
+                    "Government Expenditure (IMF, Wiki, Statistica)",
+                ]:
+                    df[col] = df[col] * rng.lognormal(0, 0.05, len(df))
+            copies.append(df)
+    panel_df = pd.concat(copies, ignore_index=True)
+    panel_df = panel_df.sort_values(["Country", "Year"], kind="stable")
+    long_range = [int(panel_df["Year"].min()), int(panel_df["Year"].max())]
+    return to_categorical(panel_df.reset_index(drop=True)), long_range
+
+
+def get_cases(panel_df: pd.DataFrame, long_range: list) -> dict:
+    """Name -> argument-free call of each benchmarked function on panel_df"""
+    last_year = long_range[1]
+    g7_df = create_country_group(panel_df, G7_COUNTRIES, "G7", "World")
+    scatter_df = get_scatter_df(g7_df, long_range, 5, growth_metric="annualized")
+    ### G7 and every member's synthetic copies, so clustering scales with countries
+    kmeans_countries = [
+        country
+        for country in scatter_df["Country"].unique()
+        if country == "G7" or re.sub(r" \d+$", "", country) in G7_COUNTRIES
+    ]
+    return {
+        "transform_spending_df": lambda: transform_spending_df(
+            panel_df, [last_year - 20, last_year - 10], [last_year - 10, last_year]
+        ),
+        "get_scatter_df average": lambda: get_scatter_df(panel_df, long_range, 5),
+        "get_scatter_df annualized": lambda: get_scatter_df(
+            panel_df, long_range, 5, growth_metric="annualized"
+        ),
+        "create_country_group": lambda: create_country_group(
+            panel_df, G7_COUNTRIES, "G7", "World"
+        ),
+        "make_region_avg_df": lambda: make_region_avg_df(panel_df, weight_pop=True),
+        "add_binned_columns": lambda: add_binned_columns(scatter_df, BIN_GROUPS),
+        "add_kmeans_clusters": lambda: add_kmeans_clusters(
+            scatter_df, n_clusters=5, countries=kmeans_countries, use_cache=False
+        ),
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    """Best wall time of repeat calls, then the Python heap peak of one more.
+
+    tracemalloc sees NumPy and pandas buffers but not memory used inside
+    joblib worker processes.
+    """
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": round(min(seconds), 5), "peak_mb": round(peak / 2**20, 3)}
+
+
+def run_benchmarks(scales: list, functions: list = None, repeat: int = 3) -> dict:
+    results = {}
+    for scale in scales:
+        panel_df, long_range = make_panel(*SCALES[scale])
+        for name, func in get_cases(panel_df, long_range).items():
+            if functions and not any(f in name for f in functions):
+                continue
+            result = measure(func, repeat)
+            result["rows"] = len(panel_df)
+            results["{0} @ {1}".format(name, scale)] = result
+            print(
+                "{0:>9.4f}s {1:>10.1f}MB {2:>9} rows  {3} @ {4}".format(
+                    result["seconds"], result["peak_mb"], len(panel_df), name, scale
+                ),
+                flush=True,
+            )
+    return results
+
+
+def print_scaling(results: dict) -> None:
+    """Log-log slope of time against rows between the real panel and each scale,
+    so 1 is linear and 2 quadratic"""
+    print("\nScaling exponent vs real panel")
+    for case, result in results.items():
+        name, scale = case.split(" @ ")
+        real = results.get(name + " @ real")
+        if scale == "real" or real is None or real["seconds"] <= 0:
+            continue
+        exponent = np.log(result["seconds"] / real["seconds"]) / np.log(
+            result["rows"] / real["rows"]
+        )
+        print("  {0:>6.2f}  {1}".format(exponent, case))
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """Cases whose time or peak memory grew by more than tolerance"""
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        for metric in ["seconds", "peak_mb"]:
+            before, after = baseline[case][metric], result[metric]
+            if (
+                after > before * (1 + tolerance)
+                and after - before > NOISE_FLOOR[metric]
+            ):
+                regressions.append(
+                    "{0}: {1} {2} -> {3} (+{4:.0%})".format(
+                        case, metric, before, after, after / before - 1
+                    )
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the utils pipeline")
+    parser.add_argument(
+        "-s", "--scales", nargs="*", default=list(SCALES), choices=list(SCALES)
+    )
+    parser.add_argument("-f", "--functions", nargs="*", help="only names containing")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store results as the baseline"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.functions, args.repeat)
+    print_scaling(results)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(dict(baseline, **results), f, indent=2, sort_keys=True)
+        sys.exit(0)
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    print("\n{0} regressions against {1}".format(len(regressions), BASELINE_PATH))
+    for regression in regressions:
+        print("  " + regression)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,228 @@
+import hashlib
+import inspect
+import json
+import os
+import pandas as pd
+
+###################
+### Definitions ###
+###################
+
+CACHE_DIR_NAME = ".cache"
+CATEGORICAL_COLUMNS = ["Country", "Region", "Subregion"]
+ROW_GROUP_SIZE = 2048
+### Set (by render_all.py) to a file that each source file read is appended to
+READS_LOG_ENV = "DATA_READS_LOG"
+### Bump to drop every memoized result, e.g. when a library's output changes
+DERIVED_VERSION = 1
+
+#################
+### Functions ###
+#################
+
+
+def file_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def get_cache_dir(path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def source_signature(path: str, meta: dict = None) -> dict:
+    """mtime/size/hash of a source file, reusing meta's hash when mtime and size match"""
+    if os.environ.get(READS_LOG_ENV):
+        with open(os.environ[READS_LOG_ENV], "a") as f:
+            f.write(os.path.abspath(path) + "\n")
+    stat = os.stat(path)
+    signature = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if (
+        meta
+        and meta.get("mtime_ns") == signature["mtime_ns"]
+        and meta.get("size") == signature["size"]
+    ):
+        signature["sha256"] = meta["sha256"]
+    else:
+        signature["sha256"] = file_sha256(path)
+    return signature
+
+
+def read_meta(meta_path: str) -> dict:
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_atomic(path: str, write_func) -> None:
+    ### Write to a temp file and swap it in, so concurrent renders never see a partial file
+    tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    write_func(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_meta(meta_path: str, meta: dict) -> None:
+    def dump(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+
+    write_atomic(meta_path, dump)
+
+
+def to_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def read_csv_cached(
+    path: str,
+    columns: list = None,
+    filters: list = None,
+    sort_by: list = None,
+    **read_csv_kwargs
+) -> pd.DataFrame:
+    """Read a CSV through a typed Parquet copy kept in data/.cache.
+
+    The copy is rebuilt when the source file's hash changes; the hash is only
+    recomputed when its mtime or size moved. Country, Region and Subregion
+    are stored as categoricals. With sort_by the copy is stored pre-sorted
+    on those columns in row groups of ROW_GROUP_SIZE, and columns and
+    filters (pyarrow filter tuples, see panel_filters) are pushed down to the
+    Parquet reader, so only the row groups and columns needed are read.
+    """
+    cache_dir = get_cache_dir(path)
+    key_source = dict(read_csv_kwargs)
+    if sort_by:
+        key_source["sort_by"] = list(sort_by)
+    kwargs_key = hashlib.sha256(
+        json.dumps(key_source, sort_keys=True, default=str).encode()
+    ).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, "{0}-{1}.parquet".format(stem, kwargs_key))
+    meta_path = cache_path + ".json"
+
+    meta = read_meta(meta_path)
+    signature = source_signature(path, meta)
+    if not os.path.exists(cache_path) or meta.get("sha256") != signature["sha256"]:
+        df = to_categorical(pd.read_csv(path, **read_csv_kwargs))
+        if sort_by:
+            df = df.sort_values(list(sort_by))
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(
+            cache_path,
+            lambda tmp_path: df.to_parquet(tmp_path, row_group_size=ROW_GROUP_SIZE),
+        )
+        write_meta(meta_path, signature)
+        if columns is None and filters is None:
+            return df
+    elif meta != signature:
+        ### Same content, new mtime (e.g. fresh checkout), so just refresh the key
+        write_meta(meta_path, signature)
+    return pd.read_parquet(cache_path, columns=columns, filters=filters)
+
+
+def panel_filters(countries: list = None, years: list = None) -> list:
+    """pyarrow filters keeping countries and the [first, last] years range"""
+    filters = []
+    if countries is not None:
+        filters.append(("Country", "in", list(countries)))
+    if years is not None:
+        filters += [("Year", ">=", years[0]), ("Year", "<=", years[1])]
+    return filters or None
+
+
+### Derived series, memoized per process and on disk
+derived_memo = {}
+source_signatures = {}
+
+
+def cached_signature(path: str) -> dict:
+    signature = source_signature(path, source_signatures.get(path))
+    source_signatures[path] = signature
+    return signature
+
+
+def code_sha256(func, seen: set = None) -> str:
+    """Hash of func's source and of the source of every function of this repo
+    it calls by name, recursively"""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    seen = set() if seen is None else seen
+    seen.add(func)
+    try:
+        source = inspect.getsource(func)
+        called = inspect.getclosurevars(func)
+        called = {**called.globals, **called.nonlocals}.values()
+    except (OSError, TypeError):
+        return func.__qualname__
+    sha = hashlib.sha256(source.encode())
+    for f in called:
+        if (
+            inspect.isfunction(f)
+            and f not in seen
+            and os.path.dirname(os.path.abspath(f.__code__.co_filename)) == repo_dir
+        ):
+            sha.update(code_sha256(f, seen).encode())
+    return sha.hexdigest()
+
+
+def read_memoized(name: str, key: dict, cache_dir: str, build_func) -> pd.DataFrame:
+    """Memoize build_func() in process and as Parquet in cache_dir under name and key.
+
+    key must be JSON serializable and change whenever the inputs would. The
+    source of build_func and the repo functions it calls, and DERIVED_VERSION,
+    are added to it, so editing the build logic invalidates old results. A
+    copy is returned, so callers are free to modify it.
+    """
+    key = hashlib.sha256(
+        json.dumps(
+            dict(
+                key, name=name, code=code_sha256(build_func), version=DERIVED_VERSION
+            ),
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()[:16]
+
+    if key not in derived_memo:
+        cache_path = os.path.join(cache_dir, "{0}-{1}.parquet".format(name, key))
+        if os.path.exists(cache_path):
+            derived_memo[key] = pd.read_parquet(cache_path)
+        else:
+            df = build_func()
+            os.makedirs(cache_dir, exist_ok=True)
+            write_atomic(cache_path, lambda tmp_path: df.to_parquet(tmp_path))
+            derived_memo[key] = df
+    return derived_memo[key].copy()
+
+
+def read_derived_cached(
+    name: str, source_paths: list, params: dict, build_func
+) -> pd.DataFrame:
+    """Memoize a DataFrame derived from source files, in process and in data/.cache.
+
+    The key combines name, the sources' content hashes and params (e.g.
+    interpolation method and window), so the preprocessing runs once per
+    distinct input no matter how many scenes ask for it.
+    """
+    return read_memoized(
+        name,
+        {
+            "sources": [cached_signature(p)["sha256"] for p in source_paths],
+            "params": params,
+        },
+        get_cache_dir(source_paths[0]),
+        build_func,
+    )
+
+
+def frame_sha256(df: pd.DataFrame) -> str:
+    return hashlib.sha256(
+        pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+    ).hexdigest()
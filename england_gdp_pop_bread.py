@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import os
 from utils import add_line_of_best_fit, add_moving_average, convert_to_moving_average
+from data_cache import read_csv_cached, read_derived_cached
+from scene_utils import coords_to_points, make_dots
 
 
 ###################
@@ -24,18 +26,29 @@ cwd = os.getcwd()
 #################
 
 
-def get_multi_chart_data() -> pd.DataFrame:
-    # Read the original data
-    df = pd.read_csv(cwd + "/data/multi_chart_data.csv")
-    complete_years = pd.DataFrame({"Year": range(1200, 2021)})
-    df = pd.merge(complete_years, df, on="Year", how="left")
-    for col in df.columns:
-        if col == "Year":
-            continue
-        df[col] = df[col].interpolate(method="quadratic")
-        df = convert_to_moving_average(df, "Year", col, 10)
-
-    return df
+def get_multi_chart_data(method: str = "quadratic", window: int = 10) -> pd.DataFrame:
+    """Yearly series interpolated with method and smoothed over window years.
+
+    Memoized on the source hash and (method, window), so rendering every
+    scene in one invocation only interpolates once.
+    """
+    path = cwd + "/data/multi_chart_data.csv"
+
+    def build() -> pd.DataFrame:
+        # Read the original data
+        df = read_csv_cached(path)
+        complete_years = pd.DataFrame({"Year": range(1200, 2021)})
+        df = pd.merge(complete_years, df, on="Year", how="left")
+        for col in df.columns:
+            if col == "Year":
+                continue
+            df[col] = df[col].interpolate(method=method)
+            df = convert_to_moving_average(df, "Year", col, window)
+        return df
+
+    return read_derived_cached(
+        "get_multi_chart_data", [path], {"method": method, "window": window}, build
+    )
 
 
 def make_axes(
@@ -675,18 +688,11 @@ class GDPPerPersonVsValueInBread1800to2000(Scene):
         )
 
         ### Create dots for each year
-        dots = []
-        years = []
-        for i in range(len(df)):
-            year = df.iloc[i]["Year"]
-            x_val = df.iloc[i]["GDP Per Person"]
-            y_val = df.iloc[i]["Labour Value in Bread (kg/h)"]
-
-            dot = Dot(
-                ax.c2p(x_val, y_val), color=XKCD.BLUE, radius=0.08, fill_opacity=0.8
-            )
-            dots.append(dot)
-            years.append(year)
+        points = coords_to_points(
+            ax, df["GDP Per Person"], df["Labour Value in Bread (kg/h)"]
+        )
+        dots = make_dots(points, XKCD.BLUE, radii=0.08, fill_opacity=0.8)
+        years = df["Year"].tolist()
 
         ### Animate dots sequentially from 1800 to 2000
         self.play(LaggedStart(*[Create(dot) for dot in dots], lag_ratio=0.2))
@@ -2,6 +2,7 @@ from manim import *
 import pandas as pd
 import os
 from utils import add_line_of_best_fit, add_moving_average
+from data_cache import read_csv_cached
 
 
 ###################
@@ -24,9 +25,9 @@ cwd = os.getcwd()
 
 
 def get_g7_debt_df(start_year: int, end_year: int) -> pd.DataFrame:
-    df = pd.read_csv(cwd + "/data/imf_gross_public_debt_20240924_inverted.csv").drop(
-        columns=["Unnamed: 0"]
-    )
+    df = read_csv_cached(
+        cwd + "/data/imf_gross_public_debt_20240924_inverted.csv"
+    ).drop(columns=["Unnamed: 0"])
     # Filter to G7 countries
     g7_df = df[
         df["Country"].isin(
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import os
 from utils import add_line_of_best_fit, add_moving_average, convert_to_moving_average
+from data_cache import read_csv_cached, read_derived_cached
+from scene_utils import coords_to_points, GrowingLine, TextCounter
 
 
 ###################
@@ -24,18 +26,29 @@ cwd = os.getcwd()
 #################
 
 
-def get_gdp_and_wages_df() -> pd.DataFrame:
-    # Read the original data
-    df = pd.read_csv(cwd + "/data/gdp_per_capita_vs_weekly_wages.csv")
-    complete_years = pd.DataFrame({"Year": range(1200, 2021)})
-    df = pd.merge(complete_years, df, on="Year", how="left")
-    for col in df.columns:
-        if col == "Year":
-            continue
-        df[col] = df[col].interpolate(method="quadratic")
-        df = convert_to_moving_average(df, "Year", col, 10)
-
-    return df
+def get_gdp_and_wages_df(method: str = "quadratic", window: int = 10) -> pd.DataFrame:
+    """Yearly series interpolated with method and smoothed over window years.
+
+    Memoized on the source hash and (method, window), so rendering every
+    scene in one invocation only interpolates once.
+    """
+    path = cwd + "/data/gdp_per_capita_vs_weekly_wages.csv"
+
+    def build() -> pd.DataFrame:
+        # Read the original data
+        df = read_csv_cached(path)
+        complete_years = pd.DataFrame({"Year": range(1200, 2021)})
+        df = pd.merge(complete_years, df, on="Year", how="left")
+        for col in df.columns:
+            if col == "Year":
+                continue
+            df[col] = df[col].interpolate(method=method)
+            df = convert_to_moving_average(df, "Year", col, window)
+        return df
+
+    return read_derived_cached(
+        "get_gdp_and_wages_df", [path], {"method": method, "window": window}, build
+    )
 
 
 def make_axes(
@@ -152,91 +165,23 @@ class GDPPerPersonVsWeeklyWages1800to2000(Scene):
         year_tracker = ValueTracker(1800)
 
         ### Create year display in bottom right corner using absolute positioning
-        year_text_display = always_redraw(
-            lambda: Text(
-                f"{int(year_tracker.get_value())}",
-                font_size=24,
-                color=BLACK,
-            ).move_to(
-                [5, -1.5, 0]
-            )  # Absolute position in bottom right
+        year_text_display = TextCounter(
+            lambda: f"{int(year_tracker.get_value())}",
+            position=[5, -1.5, 0],  # Absolute position in bottom right
+            font_size=24,
+            color=BLACK,
         )
 
-        ### Create dynamic line that updates based on year_tracker
-        def get_filtered_data(current_year):
-            """Filter data up to current year and interpolate for smooth animation"""
-            # Get all data up to the current year
-            filtered_df = df[df["Year"] <= current_year].copy()
-
-            if len(filtered_df) < 1:  # Need at least 1 point
-                return [], []
-
-            # If current_year is not a whole number, interpolate the current point
-            if current_year != int(current_year) and current_year < end_year:
-                current_year_int = int(current_year)
-                next_year = current_year_int + 1
-
-                # Find the data for current and next year
-                current_data = df[df["Year"] == current_year_int]
-                next_data = df[df["Year"] == next_year]
-
-                if not current_data.empty and not next_data.empty:
-                    # Interpolate between current and next year
-                    fraction = current_year - current_year_int
-
-                    interp_gdp = (
-                        current_data.iloc[0]["GDP /Person rolling average"]
-                        * (1 - fraction)
-                        + next_data.iloc[0]["GDP /Person rolling average"] * fraction
-                    )
-                    interp_wage = (
-                        current_data.iloc[0][
-                            "Real Average Weekly Wages (Bank of England (2017))"
-                        ]
-                        * (1 - fraction)
-                        + next_data.iloc[0][
-                            "Real Average Weekly Wages (Bank of England (2017))"
-                        ]
-                        * fraction
-                    )
-
-                    # Add the interpolated point
-                    interp_row = pd.DataFrame(
-                        {
-                            "Year": [current_year],
-                            "GDP /Person rolling average": [interp_gdp],
-                            "Real Average Weekly Wages (Bank of England (2017))": [
-                                interp_wage
-                            ],
-                        }
-                    )
-                    filtered_df = pd.concat(
-                        [filtered_df, interp_row], ignore_index=True
-                    )
-
-            if len(filtered_df) < 2:  # Need at least 2 points for a line
-                return [], []
-
-            return (
-                filtered_df["GDP /Person rolling average"].tolist(),
-                filtered_df[
-                    "Real Average Weekly Wages (Bank of England (2017))"
-                ].tolist(),
-            )
-
-        ### Create the dynamic line graph
-        dynamic_line = always_redraw(
-            lambda: (
-                ax.plot_line_graph(
-                    *get_filtered_data(year_tracker.get_value()),
-                    line_color=XKCD.BLUE,
-                    add_vertex_dots=False,
-                    stroke_width=3,
-                )
-                if get_filtered_data(year_tracker.get_value())[0]
-                else VGroup()
-            )
+        ### Precompute every vertex once; each frame only moves the tip of the line
+        line_vertices = coords_to_points(
+            ax,
+            df["GDP /Person rolling average"],
+            df["Real Average Weekly Wages (Bank of England (2017))"],
+        )
+        dynamic_line = GrowingLine(
+            line_vertices, df["Year"], stroke_color=XKCD.BLUE, stroke_width=3
         )
+        dynamic_line.add_updater(lambda m: m.set_param(year_tracker.get_value()))
 
         ### Add the year display and dynamic line to the scene
         self.add(year_text_display, dynamic_line)
@@ -2,6 +2,17 @@ from manim import *
 import numpy as np
 import pandas as pd
 import os
+from data_cache import read_csv_cached
+from scene_utils import (
+    axes_layout_key,
+    coords_to_points,
+    scatter_state,
+    DotScatter,
+    ScatterTransform,
+    state_dots,
+    TextCounter,
+    RangeAxes,
+)
 
 
 ###################
@@ -41,7 +52,7 @@ radius_map = {
 
 
 def get_gdp_consumption_uk_historical_df() -> pd.DataFrame:
-    df = pd.read_csv(cwd + "/data/gdp_consumption_uk_historical.csv")
+    df = read_csv_cached(cwd + "/data/gdp_consumption_uk_historical.csv")
     return df
 
 
@@ -54,6 +65,7 @@ def make_axes(
     log_y: bool,
     x_length: int,
     y_length: int,
+    axes_class=Axes,
 ):
     if log_y:
         y_axis_config = {
@@ -73,7 +85,7 @@ def make_axes(
         x_axis_config = {
             "numbers_to_include": x_numbers_to_include,
         }
-    ax = Axes(
+    ax = axes_class(
         x_range=x_range,
         y_range=y_range,
         x_length=x_length,
@@ -111,6 +123,7 @@ class ConsumptionVsGDP(Scene):
     def construct(self):
         ### Get data
         df = get_gdp_consumption_uk_historical_df()
+        self.dots_cache = {}
 
         ### Generate axes and labels
         ax, x_label, y_label = self.generate_axes(
@@ -129,14 +142,19 @@ class ConsumptionVsGDP(Scene):
         )
 
         ### Create dots for each country in 2023
-        gdp_median_dots = self.generate_dots(
-            df, ax, "GDP per capita", "Median Income Consumption ($/day)"
+        gdp_median_dots = DotScatter(
+            self.generate_dots(
+                df, ax, "GDP per capita", "Median Income Consumption ($/day)"
+            )
         )
 
-        ### Animate dots sequentially
+        ### Animate dots sequentially, then swap in the array-backed scatter
+        gdp_median_dots_list = state_dots(gdp_median_dots.get_state())
         self.play(
-            LaggedStart(*[Create(dot) for dot in gdp_median_dots], lag_ratio=0.05)
+            LaggedStart(*[Create(dot) for dot in gdp_median_dots_list], lag_ratio=0.05)
         )
+        self.remove(*gdp_median_dots_list)
+        self.add(gdp_median_dots)
 
         ### Pause at the end to show final result
         self.wait()
@@ -153,10 +171,7 @@ class ConsumptionVsGDP(Scene):
 
         ### Transition to faded dots
         self.play(
-            *[
-                Transform(gdp_median_dots[i], gdp_median_dots_faded[i])
-                for i in range(len(gdp_median_dots))
-            ],
+            ScatterTransform(gdp_median_dots, gdp_median_dots_faded),
             run_time=1.0,
         )
 
@@ -164,40 +179,38 @@ class ConsumptionVsGDP(Scene):
         year_tracker = ValueTracker(1750)
 
         ### Create year display in bottom right corner using absolute positioning
-        year_text_display = always_redraw(
-            lambda: Text(
-                f"{int(year_tracker.get_value())}",
-                font_size=24,
-                color=BLACK,
-            ).move_to(
-                [5, -1.5, 0]
-            )  # Absolute position in bottom right
+        year_text_display = TextCounter(
+            lambda: f"{int(year_tracker.get_value())}",
+            position=[5, -1.5, 0],  # Absolute position in bottom right
+            font_size=24,
+            color=BLACK,
         )
 
-        ### Create dynamic UK dot that follows the year tracker
-        uk_dynamic_dot = always_redraw(
-            lambda: self.create_uk_dot_for_year(df, ax, int(year_tracker.get_value()))
+        ### Create dynamic UK dot that follows the year tracker, looking each
+        ### year up in arrays built once and moving the same dot in place
+        uk_years, uk_states = self.make_uk_year_lookup(df, ax)
+        uk_dynamic_dot = DotScatter(
+            self.get_uk_dot_state(uk_years, uk_states, int(year_tracker.get_value()))
+        )
+        uk_dynamic_dot.add_updater(
+            lambda m: m.set_state(
+                self.get_uk_dot_state(
+                    uk_years, uk_states, int(year_tracker.get_value())
+                )
+            )
         )
 
         ### Generate list of dots and add to scene while value tracker changes
-        uk_dots_list = []
-        uk_df = df.loc[df["Entity"] == "United Kingdom", :]
-        for year in range(1750, 2013):
-            year_data = uk_df.loc[uk_df["Year"] == year, :]
-            if not year_data.empty:
-                x_val = year_data["GDP per capita"].values[0]
-                y_val = year_data["Median Income Consumption ($/day)"].values[0]
-                region = year_data["World regions according to OWID"].values[0]
-                size = year_data["Country Size"].values[0]
-
-                uk_dots_list.append(
-                    Dot(
-                        ax.c2p(x_val, y_val),
-                        color=colour_map[region],
-                        radius=radius_map[size],
-                        fill_opacity=0.4,  # Slightly more transparent for trail dots
-                    )
-                )
+        uk_dots_list = state_dots(
+            self.generate_dots(
+                df,
+                ax,
+                "GDP per capita",
+                "Median Income Consumption ($/day)",
+                fill_opacity=0.4,  # Slightly more transparent for trail dots
+                uk_sequence=True,
+            )
+        )
 
         ### Add the dynamic dot and year display to scene
         self.add(uk_dynamic_dot, year_text_display)
@@ -231,10 +244,7 @@ class ConsumptionVsGDP(Scene):
 
         ### Transition to unfaded dots
         self.play(
-            *[
-                Transform(gdp_median_dots[i], gdp_median_dots_unfaded[i])
-                for i in range(len(gdp_median_dots))
-            ],
+            ScatterTransform(gdp_median_dots, gdp_median_dots_unfaded),
             run_time=1.0,
         )
         self.wait(2)
@@ -284,10 +294,7 @@ class ConsumptionVsGDP(Scene):
         )
         self.play(
             Transform(y_label, lowest_10_y_label),
-            *[
-                Transform(gdp_median_dots[i], gdp_lowest_10_dots[i])
-                for i in range(len(gdp_median_dots))
-            ],
+            ScatterTransform(gdp_median_dots, gdp_lowest_10_dots),
             run_time=1.0,
         )
         self.wait()
@@ -326,24 +333,27 @@ class ConsumptionVsGDP(Scene):
         x_min_tracker = ValueTracker(3)  # Initial x_min (log scale: 10^3 = 1000)
         x_max_tracker = ValueTracker(5)  # Initial x_max (log scale: 10^5 = 100000)
 
-        ### Create new axes with always_redraw for dynamic x-axis range
-        new_ax = always_redraw(
-            lambda: make_axes(
-                x_range=[x_min_tracker.get_value(), x_max_tracker.get_value(), 1],
-                y_range=[0, 2, 1],
-                x_numbers_to_include=list(
-                    range(
-                        int(x_min_tracker.get_value()),
-                        int(x_max_tracker.get_value()) + 1,
-                        1,
-                    )
-                ),
-                y_numbers_to_include=list(range(0, 3, 1)),
-                log_x=True,
-                log_y=True,
-                x_length=12,
-                y_length=6,
-            )
+        ### Create new axes whose x range follows the trackers, moving the ticks
+        ### and reusing cached labels rather than rebuilding the axes each frame
+        new_ax = make_axes(
+            x_range=[x_min_tracker.get_value(), x_max_tracker.get_value(), 1],
+            y_range=[0, 2, 1],
+            x_numbers_to_include=list(
+                range(
+                    int(x_min_tracker.get_value()),
+                    int(x_max_tracker.get_value()) + 1,
+                    1,
+                )
+            ),
+            y_numbers_to_include=list(range(0, 3, 1)),
+            log_x=True,
+            log_y=True,
+            x_length=12,
+            y_length=6,
+            axes_class=RangeAxes,
+        )
+        new_ax.follow_ranges(
+            x_range=lambda: [x_min_tracker.get_value(), x_max_tracker.get_value(), 1]
         )
 
         ### Create new x-axis label for median consumption
@@ -380,10 +390,7 @@ class ConsumptionVsGDP(Scene):
             x_min_tracker.animate.set_value(0),  # Target x_min (log scale: 10^0 = 1)
             x_max_tracker.animate.set_value(2),  # Target x_max (log scale: 10^2 = 100)
             Transform(x_label, median_x_label),
-            *[
-                Transform(gdp_median_dots[i], median_lowest_10_dots[i])
-                for i in range(len(gdp_median_dots))
-            ],
+            ScatterTransform(gdp_median_dots, median_lowest_10_dots),
             run_time=2.0,
         )
         self.wait()
@@ -399,26 +406,31 @@ class ConsumptionVsGDP(Scene):
             (top_right[0], bottom_left[1]),
         ]
 
-    def create_uk_dot_for_year(self, df: pd.DataFrame, ax: Axes, year: int):
-        """Create a single UK dot for a specific year"""
-        uk_df = df.loc[df["Entity"] == "United Kingdom", :]
-        year_data = uk_df.loc[uk_df["Year"] == year, :]
-
-        if year_data.empty:
-            # Return invisible dot if no data for this year
-            return Dot(ax.c2p(1000, 1), radius=0.0, fill_opacity=0.0)
-
-        x_val = year_data["GDP per capita"].values[0]
-        y_val = year_data["Median Income Consumption ($/day)"].values[0]
-        region = year_data["World regions according to OWID"].values[0]
-        size = year_data["Country Size"].values[0]
-
-        return Dot(
-            ax.c2p(x_val, y_val),
-            color=colour_map[region],
-            radius=radius_map[size],
+    def make_uk_year_lookup(self, df: pd.DataFrame, ax: Axes) -> tuple:
+        """Sorted years with UK data, and the UK dot's array state in each of them"""
+        uk_df = df.loc[df["Entity"] == "United Kingdom", :].sort_values("Year")
+        uk_states = scatter_state(
+            coords_to_points(
+                ax, uk_df["GDP per capita"], uk_df["Median Income Consumption ($/day)"]
+            ),
+            uk_df["World regions according to OWID"].map(colour_map).tolist(),
+            uk_df["Country Size"].map(radius_map).to_numpy(),
             fill_opacity=0.8,
         )
+        return uk_df["Year"].to_numpy(), uk_states
+
+    def get_uk_dot_state(self, uk_years: np.ndarray, uk_states: dict, year: int):
+        """Single-dot state of the UK for a specific year"""
+        i = np.searchsorted(uk_years, year)
+        if i == len(uk_years) or uk_years[i] != year:
+            # Invisible dot if no data for this year
+            i = min(i, len(uk_years) - 1)
+            return dict(
+                {k: v[i : i + 1] for k, v in uk_states.items()},
+                radii=np.zeros(1),
+                rgbas=np.zeros((1, 4)),
+            )
+        return {k: v[i : i + 1] for k, v in uk_states.items()}
 
     def generate_dots(
         self,
@@ -429,53 +441,41 @@ class ConsumptionVsGDP(Scene):
         fill_opacity: float = 0.8,
         uk_sequence: bool = False,
     ):
-        dots = []
-        if uk_sequence:
-            uk_df = df.loc[df["Entity"] == "United Kingdom", :]
-            for year in range(1750, 2013):
-                x_val = uk_df.loc[uk_df["Year"] == year, "GDP per capita"].values[0]
-                y_val = uk_df.loc[
-                    uk_df["Year"] == year, "Median Income Consumption ($/day)"
-                ].values[0]
-                region = uk_df.loc[
-                    uk_df["Year"] == year, "World regions according to OWID"
-                ].values[0]
-                size = uk_df.loc[uk_df["Year"] == year, "Country Size"].values[0]
-                dots.append(
-                    Dot(
-                        ax.c2p(x_val, y_val),
-                        color=colour_map[region],
-                        radius=radius_map[size],
-                        fill_opacity=fill_opacity,
-                    )
+        """Array state of each country's 2023 dot, or of the UK's 1750-2012 path.
+
+        The rows are selected with one filter and colours and radii mapped
+        over whole columns. The scene asks for the same dots several times, so
+        states are cached per columns, opacity and axes layout.
+        """
+        key = (x_col, y_col, fill_opacity, uk_sequence, axes_layout_key(ax))
+        if key not in self.dots_cache:
+            if uk_sequence:
+                x_col, y_col = "GDP per capita", "Median Income Consumption ($/day)"
+                dots_df = (
+                    df.loc[df["Entity"] == "United Kingdom", :]
+                    .set_index("Year")
+                    .loc[range(1750, 2013), :]
                 )
-        else:
-            countries = df["Entity"].unique()
-            excluded_countries = ["Kosovo", "Burundi"]
-            for country in countries:
-                if country in excluded_countries:
-                    continue
-                country_df = df.loc[(df["Entity"] == country) & (df["Year"] == 2023), :]
-                x_val = country_df[x_col].values[0]
-                y_val = country_df[y_col].values[0]
-
-                region = country_df["World regions according to OWID"].values[0]
-                size = country_df["Country Size"].values[0]
-
-                if y_val < 1:
-                    colour = WHITE
-                else:
-                    colour = colour_map[region]
-                radius = radius_map[size]
-                dots.append(
-                    Dot(
-                        ax.c2p(x_val, y_val),
-                        color=colour,
-                        radius=radius,
-                        fill_opacity=fill_opacity,
-                    )
+                colours = dots_df["World regions according to OWID"].map(colour_map)
+            else:
+                excluded_countries = ["Kosovo", "Burundi"]
+                dots_df = df.loc[
+                    (df["Year"] == 2023) & ~df["Entity"].isin(excluded_countries), :
+                ].drop_duplicates("Entity")
+                colours = (
+                    dots_df["World regions according to OWID"]
+                    .map(colour_map)
+                    .mask(dots_df[y_col] < 1, WHITE)
                 )
-        return dots
+
+            ### Transform all coordinates in one call and keep the array state
+            self.dots_cache[key] = scatter_state(
+                coords_to_points(ax, dots_df[x_col], dots_df[y_col]),
+                colours.tolist(),
+                dots_df["Country Size"].map(radius_map).to_numpy(),
+                fill_opacity=fill_opacity,
+            )
+        return {k: v.copy() for k, v in self.dots_cache[key].items()}
 
     def generate_axes(
         self,
@@ -2,6 +2,7 @@ from manim import *
 import pandas as pd
 import os
 from utils import add_line_of_best_fit, add_moving_average
+from data_cache import read_csv_cached
 
 
 ###################
@@ -25,7 +26,7 @@ cwd = os.getcwd()
 
 def get_labour_value_in_bread_df() -> pd.DataFrame:
     # Read the original data
-    df = pd.read_csv(cwd + "/data/labour_value_in_bread.csv")
+    df = read_csv_cached(cwd + "/data/labour_value_in_bread.csv")
     complete_years = pd.DataFrame({"Year": range(1200, 2021)})
     df = pd.merge(complete_years, df, on="Year", how="left")
     df["Hr Rate bread (kg)"] = df["Hr Rate bread (kg)"].interpolate(method="quadratic")
@@ -37,7 +38,7 @@ def get_labour_value_in_bread_df() -> pd.DataFrame:
 
 def get_labour_value_in_bread_alt_df() -> pd.DataFrame:
     # Read the original data
-    df = pd.read_csv(cwd + "/data/labour_value_in_bread_alt.csv")
+    df = read_csv_cached(cwd + "/data/labour_value_in_bread_alt.csv")
     complete_years = pd.DataFrame({"Year": range(1200, 2021)})
     df = pd.merge(complete_years, df, on="Year", how="left")
     df["Hr Rate bread (kg)"] = df["Hr Rate bread (kg)"].interpolate(method="quadratic")
@@ -0,0 +1,299 @@
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+###################
+### Definitions ###
+###################
+
+cwd = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.path.join(cwd, "media", "profiles")
+### Data-prep functions timed in every scene, patched before the scene imports them
+DATA_FUNCTIONS = {
+    "data_cache": ["read_csv_cached", "read_derived_cached"],
+    "utils": [
+        "get_scatter_df",
+        "make_region_avg_df",
+        "create_country_groups",
+        "add_binned_columns",
+        "add_kmeans_clusters",
+        "convert_to_moving_average",
+    ],
+    "spending_store": ["get_spending_scatter_df", "get_spending_panel_df"],
+}
+### Mobjects whose construction (text layout, axis ticks) is timed on its own
+BUILD_CLASSES = ["Text", "MathTex", "Tex", "Axes", "NumberLine"]
+
+###############
+### Classes ###
+###############
+
+
+class Profiler(object):
+    """Nested wall-clock spans, aggregated per name and per call stack"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.stack = []
+        self.stats = {}
+        self.folded = defaultdict(float)
+        self.plays = []
+
+    @contextmanager
+    def span(self, name: str, category: str):
+        frame = {"name": name, "start": time.perf_counter(), "children": 0.0}
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - frame["start"]
+            path = ";".join(f["name"] for f in self.stack)
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1]["children"] += seconds
+            self_seconds = seconds - frame["children"]
+            self.folded[path] += self_seconds
+
+            stats = self.stats.setdefault(
+                (category, name), {"calls": 0, "total": 0.0, "self": 0.0, "max": 0.0}
+            )
+            stats["calls"] += 1
+            stats["total"] += seconds
+            stats["self"] += self_seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def report(self, scene_name: str) -> dict:
+        categories = defaultdict(float)
+        for (category, _), stats in self.stats.items():
+            categories[category] += stats["self"]
+        functions = [
+            dict(
+                name=name,
+                category=category,
+                calls=stats["calls"],
+                total_seconds=round(stats["total"], 4),
+                self_seconds=round(stats["self"], 4),
+                max_seconds=round(stats["max"], 4),
+            )
+            for (category, name), stats in self.stats.items()
+            if category != "play"
+        ]
+        return {
+            "scene": scene_name,
+            "total_seconds": round(sum(categories.values()), 4),
+            "categories": {k: round(v, 4) for k, v in sorted(categories.items())},
+            "functions": sorted(functions, key=lambda f: -f["self_seconds"]),
+            "plays": self.plays,
+        }
+
+
+class TimedUpdater(object):
+    """An updater that records each call, and still compares equal to the
+    function it wraps so remove_updater keeps working"""
+
+    def __init__(self, updater, name: str):
+        functools.update_wrapper(self, updater)
+        self.updater = updater
+        self.name = name
+
+    def __call__(self, *args):
+        with profiler.span(self.name, "updater"):
+            return self.updater(*args)
+
+    def __eq__(self, other):
+        return self.updater == getattr(other, "updater", other)
+
+    def __hash__(self):
+        return hash(self.updater)
+
+
+profiler = Profiler()
+
+#################
+### Functions ###
+#################
+
+
+def timed(func, name: str, category: str):
+    if getattr(func, "profiled", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profiler.span(name, category):
+            return func(*args, **kwargs)
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def updater_name(updater) -> str:
+    """Source location of an updater, or of the function always_redraw rebuilds"""
+    target = updater
+    if getattr(updater, "__qualname__", "").startswith("always_redraw"):
+        target = inspect.getclosurevars(updater).nonlocals.get("func", updater)
+    code = getattr(target, "__code__", None)
+    if code is None:
+        return type(target).__name__
+    return "{0}{1}:{2}".format(
+        "always_redraw " if target is not updater else "",
+        os.path.basename(code.co_filename),
+        code.co_firstlineno,
+    )
+
+
+def play_name(scene, index: int) -> str:
+    names = [type(animation).__name__ for animation in scene.animations or []]
+    return "play {0} [{1}]".format(index, ", ".join(names[:3]))
+
+
+def write_report(scene_name: str) -> dict:
+    report = profiler.report(scene_name)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, scene_name + ".json"), "w") as f:
+        json.dump(report, f, indent=2)
+    ### One "stack self_microseconds" line per call stack, for flamegraph.pl or speedscope
+    with open(os.path.join(PROFILE_DIR, scene_name + ".folded"), "w") as f:
+        for path, seconds in sorted(profiler.folded.items()):
+            f.write("{0} {1}\n".format(path, int(seconds * 1e6)))
+    return report
+
+
+def print_report(report: dict, n_functions: int = 15) -> None:
+    total = report["total_seconds"] or 1.0
+    print("\n{0}: {1:.1f}s".format(report["scene"], report["total_seconds"]))
+    for category, seconds in sorted(report["categories"].items(), key=lambda c: -c[1]):
+        print(
+            "  {0:<10} {1:8.2f}s {2:5.1f}%".format(
+                category, seconds, 100 * seconds / total
+            )
+        )
+    print("  {0:>8} {1:>9} {2:>9}  {3}".format("calls", "self", "total", "name"))
+    for f in report["functions"][:n_functions]:
+        print(
+            "  {0:>8} {1:8.2f}s {2:8.2f}s  {3}".format(
+                f["calls"], f["self_seconds"], f["total_seconds"], f["name"]
+            )
+        )
+
+
+def print_overview() -> None:
+    """One line per report in PROFILE_DIR, slowest scene first"""
+    reports = []
+    for file_name in sorted(os.listdir(PROFILE_DIR)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(PROFILE_DIR, file_name)) as f:
+                reports.append(json.load(f))
+    for report in sorted(reports, key=lambda r: -r["total_seconds"]):
+        categories = sorted(report["categories"].items(), key=lambda c: -c[1])
+        print(
+            "{0:8.1f}s  {1:<45} {2}".format(
+                report["total_seconds"],
+                report["scene"],
+                ", ".join("{0} {1:.1f}s".format(*c) for c in categories[:3]),
+            )
+        )
+
+
+def install() -> None:
+    """Patch manim and this repo's data-prep functions to record into profiler.
+
+    Must run before the scene module is imported, so its "from utils import"
+    lines bind the timed versions.
+    """
+    from manim import Mobject, Scene, config
+    from manim.renderer import cairo_renderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+    import manim
+
+    for module_name, names in DATA_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            func = getattr(module, name)
+            setattr(module, name, timed(func, module_name + "." + name, "data"))
+
+    for class_name in BUILD_CLASSES:
+        cls = getattr(manim, class_name)
+        cls.__init__ = timed(cls.__init__, class_name, "build")
+
+    cairo_renderer.get_hash_from_play_call = timed(
+        cairo_renderer.get_hash_from_play_call, "hash play call", "hash"
+    )
+    cairo_renderer.CairoRenderer.update_frame = timed(
+        cairo_renderer.CairoRenderer.update_frame, "update_frame", "draw"
+    )
+    SceneFileWriter.write_frame = timed(
+        SceneFileWriter.write_frame, "write_frame", "encode"
+    )
+    SceneFileWriter.combine_to_movie = timed(
+        SceneFileWriter.combine_to_movie, "combine_to_movie", "encode"
+    )
+
+    add_updater = Mobject.add_updater
+
+    def timed_add_updater(self, update_function, *args, **kwargs):
+        if not isinstance(update_function, TimedUpdater):
+            update_function = TimedUpdater(
+                update_function, "updater " + updater_name(update_function)
+            )
+        return add_updater(self, update_function, *args, **kwargs)
+
+    Mobject.add_updater = timed_add_updater
+
+    play = Scene.play
+
+    def timed_play(self, *args, **kwargs):
+        index = len(profiler.plays)
+        start = time.perf_counter()
+        with profiler.span("play {0}".format(index), "play"):
+            result = play(self, *args, **kwargs)
+        profiler.plays.append(
+            {
+                "index": index,
+                "name": play_name(self, index),
+                "seconds": round(time.perf_counter() - start, 4),
+                "run_time": round(float(self.duration), 4),
+                "skipped": bool(self.renderer.skip_animations),
+            }
+        )
+        return result
+
+    Scene.play = timed_play
+
+    render = Scene.render
+
+    def timed_render(self, *args, **kwargs):
+        ### The scene module is imported by now, so time its own get_* loaders too
+        module = sys.modules[type(self).__module__]
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("get_") and func.__module__ == module.__name__:
+                setattr(module, name, timed(func, module.__name__ + "." + name, "data"))
+
+        scene_name = type(self).__name__
+        if config.output_file:
+            scene_name = os.path.splitext(os.path.basename(str(config.output_file)))[0]
+        profiler.reset()
+        try:
+            with profiler.span(scene_name, "construct"):
+                return render(self, *args, **kwargs)
+        finally:
+            print_report(write_report(scene_name))
+
+    Scene.render = timed_render
+
+
+if __name__ == "__main__":
+    ### Same arguments as manim, e.g. python profiling.py -ql g7_debt.py G7DebtScene
+    sys.path.insert(0, cwd)
+    install()
+    from manim.__main__ import main
+
+    main(prog_name="manim")
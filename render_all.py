@@ -0,0 +1,357 @@
+import argparse
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from data_cache import READS_LOG_ENV, file_sha256, write_atomic
+
+###################
+### Definitions ###
+###################
+
+cwd = os.path.dirname(os.path.abspath(__file__))
+QUALITY_DIRS = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+STATE_PATH = os.path.join(cwd, "media", "render_state.json")
+READS_DIR = os.path.join(cwd, "media", "render_reads")
+
+#################
+### Functions ###
+#################
+
+
+def discover_modules() -> list:
+    """Top-level modules of this repo that import manim and define a class,
+    without importing them"""
+    module_names = []
+    for file_name in sorted(os.listdir(cwd)):
+        if not file_name.endswith(".py"):
+            continue
+        with open(os.path.join(cwd, file_name)) as f:
+            tree = ast.parse(f.read())
+        imports_manim = any(
+            (isinstance(node, ast.ImportFrom) and node.module == "manim")
+            or (
+                isinstance(node, ast.Import)
+                and any(alias.name == "manim" for alias in node.names)
+            )
+            for node in tree.body
+        )
+        if imports_manim and any(isinstance(n, ast.ClassDef) for n in tree.body):
+            module_names.append(file_name[: -len(".py")])
+    return module_names
+
+
+def discover_scenes(module_names: list) -> list:
+    """(module name, scene name, section names or None) for every Scene
+    subclass defined in module_names"""
+    from manim import Scene
+
+    scenes = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, Scene)
+                and obj is not Scene
+                and obj.__module__ == module_name
+            ):
+                scenes.append((module_name, name, getattr(obj, "section_names", None)))
+    return scenes
+
+
+def warm_caches(module_names: list) -> None:
+    """Run each module's argument-free get_* loader once, so the workers all
+    start from populated data/.cache files instead of racing to build them.
+
+    A loader that fails is reported and skipped; the scenes using it then
+    fail in their own render.
+    """
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith("get_") or func.__module__ != module_name:
+                continue
+            params = inspect.signature(func).parameters.values()
+            if all(p.default is not inspect.Parameter.empty for p in params):
+                try:
+                    func()
+                except Exception as e:
+                    print(
+                        "Warming {0}.{1} failed: {2!r}".format(module_name, name, e),
+                        file=sys.stderr,
+                    )
+
+
+def local_dependencies(module_name: str, seen: set = None) -> set:
+    """module_name plus every module of this repo it imports, transitively"""
+    seen = set() if seen is None else seen
+    path = os.path.join(cwd, module_name + ".py")
+    if module_name in seen or not os.path.exists(path):
+        return seen
+    seen.add(module_name)
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            local_dependencies(name.split(".")[0], seen)
+    return seen
+
+
+def input_signature(module_name: str, quality: str, data_paths: list) -> str:
+    """Hash of a scene module's code, its local imports and the data files it read"""
+    sha = hashlib.sha256(quality.encode())
+    for dependency in sorted(local_dependencies(module_name)):
+        sha.update(file_sha256(os.path.join(cwd, dependency + ".py")).encode())
+    for data_path in sorted(data_paths):
+        path = os.path.join(cwd, data_path)
+        sha.update(data_path.encode())
+        if os.path.exists(path):
+            sha.update(file_sha256(path).encode())
+    return sha.hexdigest()
+
+
+def read_state() -> dict:
+    try:
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_state(state: dict) -> None:
+    def dump(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    write_atomic(STATE_PATH, dump)
+
+
+def render_scene(
+    module_name: str,
+    scene_name: str,
+    quality: str,
+    section: str = None,
+    profile: bool = False,
+) -> tuple:
+    """Render one scene (or section) in its own manim process, so a crash only
+    fails that scene. Returns its exit code, seconds, stderr and the data
+    files it read, relative to the repo."""
+    command = [sys.executable, "-m", "manim", "render", "-q" + quality]
+    if profile:
+        ### Uncached so every play is really rendered and timed
+        command[1:3] = [os.path.join(cwd, "profiling.py")]
+        command.append("--disable_caching")
+    env = dict(os.environ)
+    output_name = scene_name
+    if section:
+        output_name = section_output_name(scene_name, section)
+        command += ["-o", output_name]
+        env["RENDER_SECTIONS"] = section
+    ### data_cache appends every source file the render reads to this log
+    reads_log = os.path.join(READS_DIR, "{0}.{1}.txt".format(module_name, output_name))
+    os.makedirs(READS_DIR, exist_ok=True)
+    if os.path.exists(reads_log):
+        os.remove(reads_log)
+    env[READS_LOG_ENV] = reads_log
+    start = time.time()
+    result = subprocess.run(
+        command + [module_name + ".py", scene_name],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    data_paths = set()
+    if os.path.exists(reads_log):
+        with open(reads_log) as f:
+            data_paths = {
+                os.path.relpath(line.strip(), cwd) for line in f if line.strip()
+            }
+    return result.returncode, time.time() - start, result.stderr, data_paths
+
+
+def state_key(module_name: str, scene_name: str, quality: str) -> str:
+    """render_state.json key, one per quality so -ql runs keep -qh entries"""
+    return "{0}.{1}@{2}".format(module_name, scene_name, quality)
+
+
+def default_jobs() -> int:
+    """Half the cores: each manim process also drives an ffmpeg encoder that
+    uses threads of its own"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def movie_stat(module_name: str, scene_name: str, quality: str) -> dict:
+    """Size and mtime of a scene's movie, None when it is missing, so a deleted
+    or rewritten movie no longer matches the state written after its render"""
+    path = os.path.join(video_dir(module_name, quality), scene_name + ".mp4")
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def section_output_name(scene_name: str, section: str) -> str:
+    return "{0}_section_{1}".format(scene_name, section)
+
+
+def video_dir(module_name: str, quality: str) -> str:
+    return os.path.join(cwd, "media", "videos", module_name, QUALITY_DIRS[quality])
+
+
+def concat_sections(
+    module_name: str, scene_name: str, sections: list, quality: str
+) -> int:
+    """Join a scene's section movies into its full movie without re-encoding"""
+    movie_dir = video_dir(module_name, quality)
+    list_path = os.path.join(movie_dir, scene_name + "_sections.txt")
+    with open(list_path, "w") as f:
+        for section in sections:
+            f.write("file '{0}.mp4'\n".format(section_output_name(scene_name, section)))
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0"]
+        + ["-i", list_path, "-c", "copy"]
+        + [os.path.join(movie_dir, scene_name + ".mp4")]
+    )
+    return result.returncode
+
+
+def render_all(
+    scene_filter: list = None,
+    quality: str = "h",
+    jobs: int = None,
+    force: bool = False,
+    profile: bool = False,
+) -> int:
+    """Render every Scene in this repo across jobs parallel manim processes
+    (default_jobs() when None).
+
+    Scenes with a section_names attribute are split into one render per
+    section, and the section movies are then concatenated. A scene is
+    skipped when its movie at this quality is the one its last successful
+    render wrote (same size and mtime) and its code, and the data
+    files its last successful render at this quality read, are unchanged
+    since. With profile every selected scene is rendered through
+    profiling.py, which writes a timing report per scene (or section) to
+    media/profiles. Returns the number of failed scenes.
+    """
+    sys.path.insert(0, cwd)
+    os.chdir(cwd)
+    scenes = discover_scenes(discover_modules())
+    if scene_filter:
+        scenes = [s for s in scenes if s[1] in scene_filter or s[0] in scene_filter]
+
+    state = read_state()
+
+    def is_unchanged(module_name: str, scene_name: str) -> bool:
+        entry = state.get(state_key(module_name, scene_name, quality))
+        return (
+            bool(entry)
+            and entry.get("movie") == movie_stat(module_name, scene_name, quality)
+            and entry["signature"]
+            == input_signature(module_name, quality, entry.get("inputs", []))
+        )
+
+    to_render = [
+        (module_name, scene_name, sections)
+        for module_name, scene_name, sections in scenes
+        if force or profile or not is_unchanged(module_name, scene_name)
+    ]
+    print(
+        "Rendering {0} of {1} scenes ({2} unchanged)".format(
+            len(to_render), len(scenes), len(scenes) - len(to_render)
+        )
+    )
+    if not to_render:
+        return 0
+
+    warm_caches(sorted({s[0] for s in to_render}))
+
+    ### One job per scene, or per section for sectioned scenes, queued round
+    ### robin so one scene's sections do not take up every worker at once
+    render_jobs = sorted(
+        (
+            (i, module_name, scene_name, section)
+            for module_name, scene_name, sections in to_render
+            for i, section in enumerate(sections or [None])
+        ),
+        key=lambda job: job[0],
+    )
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs or default_jobs()) as pool:
+        futures = {
+            pool.submit(
+                render_scene, module_name, scene_name, quality, section, profile
+            ): (module_name, scene_name, section)
+            for _, module_name, scene_name, section in render_jobs
+        }
+        for future in as_completed(futures):
+            module_name, scene_name, section = futures[future]
+            returncode, seconds, stderr, data_paths = future.result()
+            key = "{0}.{1}".format(module_name, scene_name)
+            label = key + (":" + section if section else "")
+            print("{0:>4} {1:8.1f}s  {2}".format(returncode, seconds, label))
+            if returncode != 0:
+                print(stderr[-2000:], file=sys.stderr)
+            results.setdefault(key, []).append((returncode, seconds, data_paths))
+
+    n_failed = 0
+    for module_name, scene_name, sections in to_render:
+        key = "{0}.{1}".format(module_name, scene_name)
+        failed = any(r[0] != 0 for r in results[key])
+        if sections and not failed:
+            failed = concat_sections(module_name, scene_name, sections, quality) != 0
+        if failed:
+            n_failed += 1
+            continue
+        inputs = sorted(set().union(*[r[2] for r in results[key]]))
+        state[state_key(module_name, scene_name, quality)] = {
+            "signature": input_signature(module_name, quality, inputs),
+            "inputs": inputs,
+            "movie": movie_stat(module_name, scene_name, quality),
+            "seconds": round(sum(r[1] for r in results[key]), 1),
+        }
+    write_state(state)
+    if profile:
+        from profiling import print_overview
+
+        print_overview()
+    return n_failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every project Scene")
+    parser.add_argument("scenes", nargs="*", help="scene or module names to render")
+    parser.add_argument("-q", "--quality", default="h", choices=list("lmhpk"))
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="workers (default: half the cores)"
+    )
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument(
+        "--profile", action="store_true", help="write timing reports to media/profiles"
+    )
+    args = parser.parse_args()
+    n_failed = render_all(
+        args.scenes, args.quality, args.jobs, args.force, args.profile
+    )
+    sys.exit(1 if n_failed else 0)
@@ -1,6 +1,15 @@
 from manim import *
+import numpy as np
 import pandas as pd
 import os
+from data_cache import read_csv_cached, read_derived_cached
+from scene_utils import (
+    coords_to_points,
+    scatter_state,
+    state_dots,
+    DotScatter,
+    ScatterTransform,
+)
 
 ###################
 ### Definitions ###
@@ -23,10 +32,36 @@ jobs = ["all_jobs", "bricklayer", "doctor", "nurse"]
 
 def get_salaries_df(job: str) -> pd.DataFrame:
     cwd = os.getcwd()
-    df = pd.read_csv(cwd + "/data/{}.csv".format(job), index_col=0)
+    df = read_csv_cached(cwd + "/data/{}.csv".format(job), index_col=0)
     return df
 
 
+def get_salaries_wide_df(jobs: list = jobs) -> pd.DataFrame:
+    """One row per country, with each job's pay in a column named after the job.
+
+    The job tables share their Country, Region, Population and GDP columns,
+    so they are joined on Country once (memoized on the sources' hashes)
+    rather than read and indexed per job.
+    """
+    cwd = os.getcwd()
+    paths = [cwd + "/data/{}.csv".format(job) for job in jobs]
+
+    def build() -> pd.DataFrame:
+        wide_df = None
+        for job in jobs:
+            pay_col = "Mean_USD" if job == "all_jobs" else "Median_USD"
+            df = get_salaries_df(job=job).rename(columns={pay_col: job})
+            if wide_df is None:
+                wide_df = df
+            else:
+                wide_df = wide_df.merge(df[["Country", job]], on="Country")
+        return wide_df.reset_index(drop=True)
+
+    return read_derived_cached(
+        "get_salaries_wide_df", paths, {"jobs": list(jobs)}, build
+    )
+
+
 def add_radius_col(
     df: pd.DataFrame, lowest_radius: float, highest_radius: float
 ) -> pd.DataFrame:
@@ -54,6 +89,13 @@ def make_axes():
     return ax
 
 
+def make_title(job: str) -> Text:
+    title = Text(
+        r"{}".format(" ".join([s.capitalize() for s in job.split("_")])), font_size=30
+    )
+    return title.to_edge(UP)
+
+
 ###############
 ### Classes ###
 ###############
@@ -66,68 +108,62 @@ def make_axes():
 
 class SalariesScatterPlotAnimatedScene(Scene):
     def construct(self):
-        axes_dict, dots_dict, titles_dict = self.generate_data_dicts(jobs=jobs)
-        self.generate_play_transforms(jobs=jobs, data_dicts=(axes_dict, dots_dict, titles_dict))
+        df = get_salaries_wide_df(jobs=jobs)
+        df = add_radius_col(df, lowest_radius=0.05, highest_radius=0.85)
+        ax, title = self.generate_plot(job=jobs[0])
+        states = self.generate_job_states(df, ax, jobs=jobs)
+
+        ### Animate the creation of dots, then swap in the array-backed scatter
+        dots = DotScatter(states[0])
+        dots_list = state_dots(states[0])
+        self.play(LaggedStart(*[Write(dot) for dot in dots_list], lag_ratio=0.05))
+        self.remove(*dots_list)
+        self.add(dots)
+        self.wait()  # wait for 1 second
+
+        self.generate_play_transforms(jobs=jobs, dots=dots, title=title, states=states)
         self.wait(2)
-        
-
-    def generate_play_transforms(self, jobs: list, data_dicts: tuple):
-        axes_dict, dots_dict, titles_dict = data_dicts
-        
-        for j in range(len(jobs)-1):
-            axes_transforms, dots_transforms, titles_transforms = [], [], []
-            axes_transforms.append(Transform(axes_dict[jobs[0]], axes_dict[jobs[j+1]]))
-            titles_transforms.append(Transform(titles_dict[jobs[0]], titles_dict[jobs[j+1]]))
-            for d, dot in enumerate(dots_dict[jobs[j+1]]):
-                dots_transforms.append(Transform(dots_dict[jobs[0]][d], dots_dict[jobs[j+1]][d]))
-            self.play(*axes_transforms,
-                      *dots_transforms,
-                      *titles_transforms)
+
+    def generate_play_transforms(
+        self, jobs: list, dots: DotScatter, title: Text, states: list
+    ):
+        ### The axes are the same for every job, so only dots and title move
+        for job, state in zip(jobs[1:], states[1:]):
+            self.play(ScatterTransform(dots, state), Transform(title, make_title(job)))
             self.wait(3.5)
         return None
-    
-    def generate_data_dicts(self, jobs: list):
-        axes_dict, dots_dict, titles_dict = {}, {}, {}
-        for j, job in enumerate(jobs):
-            animate_axes, animate_dots = (True, True) if j == 0 else (False, False)
-            ax, dots, title = self.generate_plot(job=job, animate_axes=animate_axes, animate_dots=animate_dots)
-            axes_dict[job], dots_dict[job], titles_dict[job] = ax, dots, title
-        return axes_dict, dots_dict, titles_dict
-    
-    def generate_plot(self, job: str, animate_axes: bool, animate_dots: bool):
-        ### Download data and put in DataFrame
-        df = get_salaries_df(job=job)
-        df = add_radius_col(df, lowest_radius=0.05, highest_radius=0.85)
-        pay_col = "Mean_USD" if job == "all_jobs" else "Median_USD"
+
+    def generate_job_states(self, df: pd.DataFrame, ax: Axes, jobs: list) -> list:
+        """DotScatter state per job, placed with one coords_to_points call over
+        the (country x job) pay array"""
+        pay = df[jobs].to_numpy(dtype=float)
+        gdp = df["GDP_per_capita_USD"].to_numpy(dtype=float)
+        points = coords_to_points(ax, np.tile(gdp, len(jobs)), pay.T.ravel())
+        colours = df["Region"].map(colour_map).tolist()
+        base_state = scatter_state(
+            points[: len(df)], colours, df["radius"], fill_opacity=0.65
+        )
+        return [
+            dict(base_state, centers=job_points)
+            for job_points in points.reshape(len(jobs), len(df), 3)
+        ]
+
+    def generate_plot(self, job: str):
         ax = make_axes()
         ### Add axis labels
         x_label = ax.get_x_axis_label(Text("GDP per Capita (USD)", font_size=26))
         y_label = ax.get_y_axis_label(Text("Average Salary (USD)", font_size=26))
         ### Add title
-        title = Text(r"{}".format(" ".join([s.capitalize() for s in job.split("_")])), font_size=30)
-        title.to_edge(UP)
-
-        if animate_axes:
-            ### Animate the creation of Axes
-            self.play(Write(ax))
-            self.play(Write(x_label))
-            self.play(Write(y_label))
-            self.play(Write(title))
-            self.wait()  # wait for 1 second
-        
-        dots = []
-        for i in range(df.shape[0]):
-            x, y = df.loc[i, ["GDP_per_capita_USD", pay_col]].values
-            colour = colour_map[df.loc[i, ["Region"]].values[0]]
-            radius = df.loc[i, ["radius"]].values[0]
-            dots.append(Dot(ax.c2p(x, y), color=colour, radius=radius, fill_opacity=0.65))
-
-        if animate_dots:
-            ### Animate the creation of dots
-            self.play(LaggedStart(*[Write(dot) for dot in dots], lag_ratio=0.05))
-            self.wait()  # wait for 1 second
-
-        return ax, dots, title
+        title = make_title(job)
+
+        ### Animate the creation of Axes
+        self.play(Write(ax))
+        self.play(Write(x_label))
+        self.play(Write(y_label))
+        self.play(Write(title))
+        self.wait()  # wait for 1 second
+
+        return ax, title
 
 
 if __name__ == "__main__":
@@ -0,0 +1,547 @@
+from manim import *
+import numpy as np
+import pandas as pd
+
+#################
+### Functions ###
+#################
+
+
+def axes_map(ax: Axes) -> tuple:
+    """(origin, x_unit, y_unit) of ax: where its range minimum is drawn and
+    the screen vectors spanning each axis' full range"""
+    x_scaling, y_scaling = ax.x_axis.scaling, ax.y_axis.scaling
+    x_min, x_max = ax.x_axis.x_range[:2]
+    y_min, y_max = ax.y_axis.x_range[:2]
+
+    origin = np.asarray(ax.c2p(x_scaling.function(x_min), y_scaling.function(y_min)))
+    x_unit = ax.c2p(x_scaling.function(x_max), y_scaling.function(y_min)) - origin
+    y_unit = ax.c2p(x_scaling.function(x_min), y_scaling.function(y_max)) - origin
+    return origin, x_unit, y_unit
+
+
+def axes_layout_key(ax: Axes) -> tuple:
+    """Hashable ranges, scaling and screen map of ax, equal for axes that
+    place every coordinate at the same point"""
+    return (
+        tuple(ax.x_axis.x_range[:2]),
+        tuple(ax.y_axis.x_range[:2]),
+        type(ax.x_axis.scaling).__name__,
+        type(ax.y_axis.scaling).__name__,
+        np.round(np.concatenate(axes_map(ax)), 6).tobytes(),
+    )
+
+
+def coords_to_points(ax: Axes, x_values, y_values) -> np.ndarray:
+    """Vectorized ax.c2p over whole coordinate arrays, returning an (N, 3) array.
+
+    c2p is affine in each axis' scaled coordinate (the exponent on LogBase
+    axes), so three reference calls to ax.c2p pin down the map and every
+    point is then placed with one NumPy expression.
+    """
+    x_scaling, y_scaling = ax.x_axis.scaling, ax.y_axis.scaling
+    x_min, x_max = ax.x_axis.x_range[:2]
+    y_min, y_max = ax.y_axis.x_range[:2]
+    origin, x_unit, y_unit = axes_map(ax)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_scaled = x_scaling.inverse_function(np.asarray(x_values, dtype=float))
+        y_scaled = y_scaling.inverse_function(np.asarray(y_values, dtype=float))
+    x_alphas = (np.atleast_1d(x_scaled) - x_min) / (x_max - x_min)
+    y_alphas = (np.atleast_1d(y_scaled) - y_min) / (y_max - y_min)
+    return origin + np.outer(x_alphas, x_unit) + np.outer(y_alphas, y_unit)
+
+
+def polyline_segments(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Cubic Bezier points of straight segments starts[i] -> ends[i], laid out
+    as set_points_as_corners does (handles at thirds), as a (4N, 3) array"""
+    return np.stack(
+        [starts, starts + (ends - starts) / 3, starts + 2 * (ends - starts) / 3, ends],
+        axis=1,
+    ).reshape(-1, 3)
+
+
+def make_dots(points: np.ndarray, colours, radii, fill_opacity=0.8) -> list:
+    """One Dot per row of points; colours, radii and fill_opacity are scalars or per-dot"""
+    n_dots = len(points)
+    if not isinstance(colours, (list, tuple, np.ndarray)):
+        colours = [colours] * n_dots
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (n_dots,))
+    fill_opacity = np.broadcast_to(np.asarray(fill_opacity, dtype=float), (n_dots,))
+    return [
+        Dot(point, color=colour, radius=radius, fill_opacity=opacity)
+        for point, colour, radius, opacity in zip(points, colours, radii, fill_opacity)
+    ]
+
+
+def scatter_state(points: np.ndarray, colours, radii, fill_opacity=0.8) -> dict:
+    """Array state of a DotScatter: centers (N, 3), radii (N,) and fill rgbas (N, 4)"""
+    centers = np.array(points, dtype=float).reshape(-1, 3)
+    n_dots = len(centers)
+    if not isinstance(colours, (list, tuple, np.ndarray)):
+        colours = [colours] * n_dots
+    rgbas = np.zeros((n_dots, 4))
+    if n_dots:
+        rgbas[:, :3] = [color_to_rgb(colour) for colour in colours]
+    rgbas[:, 3] = fill_opacity
+    return {
+        "centers": centers,
+        "radii": np.broadcast_to(np.asarray(radii, dtype=float), (n_dots,)).copy(),
+        "rgbas": rgbas,
+    }
+
+
+def state_dots(state: dict) -> list:
+    """One Dot per point of a DotScatter state, for per-dot animations such as
+    a LaggedStart of Create; swap in the DotScatter once they have finished"""
+    return make_dots(
+        state["centers"],
+        [ManimColor.from_rgb(rgb) for rgb in state["rgbas"][:, :3]],
+        state["radii"],
+        fill_opacity=state["rgbas"][:, 3],
+    )
+
+
+###############
+### Classes ###
+###############
+
+
+class DotScatter(VGroup):
+    """Dots driven by NumPy arrays of centers, radii and fill rgbas.
+
+    Every dot is the same unit-circle outline scaled and shifted, and dots
+    sharing an rgba are drawn as subpaths of one VMobject, so a new state is
+    one broadcast plus a write per colour bucket rather than per dot. Dots
+    in the same bucket are filled as one shape, so where they overlap they
+    are not darkened the way stacked Dots are. The arrays in self.state are
+    the source of truth; move the scatter with set_state/ScatterTransform
+    rather than shift or scale. Use state_dots for per-dot animations.
+    """
+
+    def __init__(self, state: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.unit_outline = Dot(ORIGIN, radius=1.0).points.copy()
+        self.buckets = []
+        self.set_state(state)
+
+    def get_state(self) -> dict:
+        return {key: value.copy() for key, value in self.state.items()}
+
+    def set_state(self, state: dict):
+        self.state = {
+            key: np.asarray(state[key], dtype=float)
+            for key in ("centers", "radii", "rgbas")
+        }
+        outlines = (
+            self.unit_outline[np.newaxis]
+            * self.state["radii"][:, np.newaxis, np.newaxis]
+            + self.state["centers"][:, np.newaxis, :]
+        )
+        rgbas, bucket_index = np.unique(
+            self.state["rgbas"].reshape(-1, 4), axis=0, return_inverse=True
+        )
+        bucket_index = bucket_index.ravel()
+        splits = np.cumsum(np.bincount(bucket_index, minlength=len(rgbas)))[:-1]
+        bucket_outlines = np.split(
+            outlines[np.argsort(bucket_index, kind="stable")], splits
+        )
+        ### Buckets are reused between states, so a transform allocates none
+        while len(self.buckets) < len(rgbas):
+            self.buckets.append(VMobject(stroke_width=0))
+        for bucket, rgba, outline in zip(self.buckets, rgbas, bucket_outlines):
+            bucket.points = outline.reshape(-1, 3)
+            bucket.fill_rgbas = rgba[np.newaxis].copy()
+            ### Opaque stroke in the fill colour, as Dot(color=...) has, for Write
+            bucket.stroke_rgbas = np.append(rgba[:3], 1.0)[np.newaxis]
+        self.submobjects = self.buckets[: len(rgbas)]
+        return self
+
+
+class ScatterTransform(Animation):
+    """Move a DotScatter to a target state, interpolating all of its arrays at once.
+
+    Replaces one Transform per dot: "fade every dot" or "move every dot to a
+    new y column" becomes a single animation.
+    """
+
+    def __init__(self, scatter: DotScatter, target, **kwargs):
+        if isinstance(target, DotScatter):
+            target = target.get_state()
+        self.target_state = target
+        super().__init__(scatter, **kwargs)
+
+    def create_starting_mobject(self) -> Mobject:
+        ### The start is kept as arrays in begin(), so skip copying every dot
+        return Mobject()
+
+    def begin(self) -> None:
+        self.start_state = self.mobject.get_state()
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        alpha = self.rate_func(alpha)
+        self.mobject.set_state(
+            {
+                key: interpolate(start, self.target_state[key], alpha)
+                for key, start in self.start_state.items()
+            }
+        )
+
+
+class GrowingLine(VMobject):
+    """Polyline revealed up to a running parameter (e.g. the year) without rebuilding.
+
+    The Bezier segments between all vertices are built once. set_param only
+    writes the interpolated tip segment into a working buffer and points the
+    VMobject at a slice of it, so the cost per frame is O(1) instead of
+    O(vertices). The buffer is shared with self.points, so drive the line
+    through set_param rather than shift or scale.
+    """
+
+    def __init__(self, vertices: np.ndarray, params, **kwargs):
+        super().__init__(**kwargs)
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.params = np.asarray(params, dtype=float)
+        self.segments = polyline_segments(self.vertices[:-1], self.vertices[1:])
+        self.buffer = self.segments.copy()
+        self.tip_slot = None
+        self.set_param(self.params[0] if len(self.params) else 0)
+
+    def set_param(self, value: float):
+        n_vertices = len(self.vertices)
+        n_revealed = int(np.searchsorted(self.params, value, side="right"))
+
+        ### Put back the real segment where the previous tip was drawn
+        if self.tip_slot is not None:
+            slot = slice(4 * self.tip_slot, 4 * self.tip_slot + 4)
+            self.buffer[slot] = self.segments[slot]
+            self.tip_slot = None
+
+        n_points = 4 * max(n_revealed - 1, 0)
+        if 0 < n_revealed < n_vertices and value > self.params[n_revealed - 1]:
+            start, end = self.vertices[n_revealed - 1], self.vertices[n_revealed]
+            fraction = (value - self.params[n_revealed - 1]) / (
+                self.params[n_revealed] - self.params[n_revealed - 1]
+            )
+            tip = start + fraction * (end - start)
+            self.tip_slot = n_revealed - 1
+            self.buffer[n_points : n_points + 4] = [
+                start,
+                start + (tip - start) / 3,
+                start + 2 * (tip - start) / 3,
+                tip,
+            ]
+            n_points += 4
+
+        self.points = self.buffer[:n_points]
+        return self
+
+
+class TextCounter(VGroup):
+    """Text label that is only reshaped when its string changes.
+
+    label_func is called every frame for the string to show. Each distinct
+    string (with the same Text kwargs) is built by Pango once per process and
+    kept in a class-level cache, so a year counter sweeping 200 years shapes
+    200 Texts instead of one per frame. The label is a copy of the cached
+    Text, so animations on the counter never alter the cache. position is a
+    point, or a function returning one, for the label's center.
+    """
+
+    text_cache = {}
+
+    def __init__(self, label_func, position=ORIGIN, **text_kwargs):
+        super().__init__()
+        self.label_func = label_func
+        self.position = position
+        self.text_kwargs = text_kwargs
+        self.label = None
+        self.update_label()
+        self.add_updater(lambda m: m.update_label())
+
+    def get_text(self, label: str) -> Text:
+        key = (label, repr(sorted(self.text_kwargs.items())))
+        if key not in TextCounter.text_cache:
+            TextCounter.text_cache[key] = Text(label, **self.text_kwargs)
+        return TextCounter.text_cache[key]
+
+    def update_label(self):
+        label = self.label_func()
+        if label != self.label:
+            self.label = label
+            self.remove(*self.submobjects)
+            self.add(self.get_text(label).copy())
+        position = self.position() if callable(self.position) else self.position
+        self.submobjects[0].move_to(position)
+        return self
+
+
+class RangeAxes(Axes):
+    """Axes whose ranges can change every frame without being rebuilt.
+
+    set_ranges puts the axis lines where a fresh Axes of the same lengths
+    would have them and moves the existing ticks. It then shows one label per
+    tick, or per numbers_to_include value inside the range. Labels are built
+    once per displayed value and cached, so a range animation only creates a
+    label when a new value first comes into view. Labels are drawn in
+    label_color, or the axis colour. Use follow_ranges to drive the ranges
+    from ValueTrackers instead of rebuilding Axes in an updater.
+    """
+
+    def __init__(self, x_range=None, y_range=None, label_color=None, **kwargs):
+        axis_config = dict(kwargs.pop("axis_config", None) or {})
+        self.show_labels, self.numbers_to_include = [], []
+        for name in ["x_axis_config", "y_axis_config"]:
+            config = dict(kwargs.pop(name, None) or {})
+            numbers = config.pop("numbers_to_include", None)
+            self.numbers_to_include.append(numbers)
+            self.show_labels.append(
+                numbers is not None
+                or config.get("include_numbers", axis_config.get("include_numbers"))
+            )
+            config["include_numbers"] = False
+            kwargs[name] = config
+        super().__init__(x_range, y_range, axis_config=axis_config, **kwargs)
+
+        self.label_color = label_color
+        self.label_cache = [{}, {}]
+        self.label_keys = [None, None]
+        self.coordinate_labels = VGroup(VGroup(), VGroup())
+        self.add(self.coordinate_labels)
+        self.update_labels()
+
+    def add_coordinates(self, *args, **kwargs):
+        ### Labels are kept in sync with the ranges, so just make sure they show
+        self.show_labels = [True, True]
+        return self.update_labels()
+
+    def follow_ranges(self, x_range=None, y_range=None):
+        """Set the ranges from x_range() and/or y_range() every frame"""
+        return self.add_updater(
+            lambda m: m.set_ranges(
+                x_range() if x_range else None, y_range() if y_range else None
+            )
+        )
+
+    def set_ranges(self, x_range=None, y_range=None):
+        ranges = []
+        for axis, new_range in zip(self.axes, [x_range, y_range]):
+            if new_range is None:
+                new_range = axis.x_range
+            elif len(new_range) == 2:
+                new_range = [*new_range, axis.x_range[2]]
+            ranges.append(np.array(new_range, dtype=float))
+        if all(np.array_equal(r, axis.x_range) for r, axis in zip(ranges, self.axes)):
+            return self
+
+        ### Box center, axis directions and lengths of the current geometry
+        center = self.c2p(
+            *[axis.scaling.function(np.mean(axis.x_range[:2])) for axis in self.axes]
+        )
+        lengths = [axis.get_length() for axis in self.axes]
+        directions = [
+            (axis.get_end() - axis.get_start()) / length
+            for axis, length in zip(self.axes, lengths)
+        ]
+
+        ### Each axis crosses the other at its origin, as in Axes.__init__
+        offsets = []
+        for axis, (start, end, _), length in zip(self.axes, ranges, lengths):
+            origin = axis.scaling.inverse_function(
+                self._origin_shift(axis.scaling.function(np.array([start, end])))
+            )
+            offsets.append((origin - (start + end) / 2) / (end - start) * length)
+        for i, axis in enumerate(self.axes):
+            start = (
+                center
+                - directions[i] * lengths[i] / 2
+                + directions[1 - i] * offsets[1 - i]
+            )
+            axis.set_points_as_corners([start, start + directions[i] * lengths[i]])
+            axis.x_range = ranges[i]
+            axis.x_min, axis.x_max, axis.x_step = axis.scaling.function(ranges[i])
+        self.x_range, self.y_range = [list(r) for r in ranges]
+
+        for axis in self.axes:
+            if axis.include_ticks:
+                self.update_ticks(axis)
+        return self.update_labels()
+
+    def update_ticks(self, axis: NumberLine):
+        values = axis.get_tick_range()
+        ticks = axis.ticks
+        ticks.remove(*ticks.submobjects[len(values) :])
+        for i, value in enumerate(values):
+            if i < len(ticks):
+                ticks[i].move_to(axis.number_to_point(value))
+            else:
+                ticks.add(axis.get_tick(value))
+
+    def get_label_values(self, i: int) -> list:
+        axis = self.axes[i]
+        if not self.show_labels[i]:
+            return []
+        numbers = self.numbers_to_include[i]
+        if numbers is None or axis.scaling.custom_labels:
+            numbers = axis.get_tick_range()
+        low, high = sorted([axis.x_min, axis.x_max])
+        return [
+            x
+            for x in numbers
+            if low - 1e-6 <= x <= high + 1e-6 and x not in axis.numbers_to_exclude
+        ]
+
+    def get_label(self, i: int, x: float, key) -> VMobject:
+        axis = self.axes[i]
+        if key not in self.label_cache[i]:
+            if axis.scaling.custom_labels:
+                label = axis.scaling.get_custom_labels(
+                    [x],
+                    unit_decimal_places=axis.decimal_number_config[
+                        "num_decimal_places"
+                    ],
+                )[0]
+                label.font_size = axis.font_size
+            else:
+                label = axis.get_number_mobject(x)
+            label.set_color(self.label_color or axis.get_color())
+            self.label_cache[i][key] = label
+        return self.label_cache[i][key]
+
+    def update_labels(self):
+        for i, (axis, labels) in enumerate(zip(self.axes, self.coordinate_labels)):
+            values = self.get_label_values(i)
+            ### Labels are keyed on the text they show, so they are reused
+            ### even while the tick values themselves drift
+            places = axis.decimal_number_config.get("num_decimal_places", 0)
+            keys = tuple(
+                round(
+                    float(
+                        axis.scaling.inverse_function(x)
+                        if axis.scaling.custom_labels
+                        else x
+                    ),
+                    places,
+                )
+                for x in values
+            )
+            if keys != self.label_keys[i]:
+                new_labels = []
+                for x, key in zip(values, keys):
+                    label = self.get_label(i, x, key)
+                    new_labels.append(label.copy() if label in new_labels else label)
+                labels.remove(*labels.submobjects)
+                labels.add(*new_labels)
+                self.label_keys[i] = keys
+
+            for x, label in zip(values, labels):
+                label.next_to(
+                    axis.number_to_point(x),
+                    direction=axis.label_direction,
+                    buff=axis.line_to_number_buff,
+                )
+                if x < 0 and axis.label_direction[0] == 0:
+                    label.shift(label[0].width * LEFT / 2)
+        return self
+
+
+class RasterLayer(ImageMobject):
+    """Full-frame bitmap that dots are stamped into once they stop moving.
+
+    Old dots kept as mobjects cost memory and drawing time that grow with
+    their number. Stamped here, they are pixels in one frame-sized RGBA
+    array. That array is drawn as a single image, and as part of the static
+    background whenever the layer is not animated. stamp takes the same
+    arguments as scatter_state.
+    """
+
+    def __init__(self, **kwargs):
+        pixels = np.zeros((config.pixel_height, config.pixel_width, 4), dtype=np.uint8)
+        super().__init__(pixels, scale_to_resolution=config.pixel_height, **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.pixels_per_unit = config.pixel_width / config.frame_width
+
+    def stamp(self, points: np.ndarray, colours, radii, fill_opacity=0.8):
+        state = scatter_state(points, colours, radii, fill_opacity)
+        height, width = self.pixel_array.shape[:2]
+        centers = np.column_stack(
+            [
+                (state["centers"][:, 0] + config.frame_width / 2)
+                * self.pixels_per_unit,
+                (config.frame_height / 2 - state["centers"][:, 1])
+                * self.pixels_per_unit,
+            ]
+        )
+        for (x, y), radius, rgba in zip(
+            centers, state["radii"] * self.pixels_per_unit, state["rgbas"]
+        ):
+            x0, x1 = max(int(x - radius - 1), 0), min(int(x + radius + 2), width)
+            y0, y1 = max(int(y - radius - 1), 0), min(int(y + radius + 2), height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+
+            ### Antialiased disc coverage, composited "over" the region
+            grid_y, grid_x = np.mgrid[y0:y1, x0:x1]
+            distance = np.hypot(grid_x + 0.5 - x, grid_y + 0.5 - y)
+            alpha = np.clip(radius - distance + 0.5, 0, 1)[..., np.newaxis] * rgba[3]
+            region = self.pixel_array[y0:y1, x0:x1].astype(float) / 255
+            out_alpha = alpha + region[..., 3:] * (1 - alpha)
+            out_rgb = rgba[:3] * alpha + region[..., :3] * region[..., 3:] * (1 - alpha)
+            out_rgb = np.divide(
+                out_rgb, out_alpha, out=np.zeros_like(out_rgb), where=out_alpha > 0
+            )
+            self.pixel_array[y0:y1, x0:x1] = np.round(
+                255 * np.concatenate([out_rgb, out_alpha], axis=-1)
+            )
+        return self
+
+
+class LineGeometryCache(object):
+    """Bezier points of every country's line graph, computed once per axes layout.
+
+    The panel is split by country once. place puts any number of countries'
+    lines on an axes in one pass: their series are concatenated, mapped with
+    a single coords_to_points call and expanded to Bezier segments with one
+    NumPy expression, dropping the segments that would join one country to
+    the next. Later requests copy the stored points into a new VMobject. The
+    layout key is the axes' ranges, scaling and screen map, so moving or
+    rescaling the axes gives new geometry rather than stale points.
+    """
+
+    def __init__(self, df: pd.DataFrame, x_col: str = "Year", by: str = "Country"):
+        self.x_col = x_col
+        self.series = {
+            key: group.sort_values(x_col, kind="stable")
+            for key, group in df.groupby(by, observed=True, sort=False)
+        }
+        self.points = {}
+
+    def place(self, ax: Axes, keys, y_col: str) -> None:
+        layout = axes_layout_key(ax)
+        keys = [key for key in keys if (key, y_col, layout) not in self.points]
+        if not keys:
+            return
+        series = [self.series[key] for key in keys]
+        corners = coords_to_points(
+            ax,
+            np.concatenate([s[self.x_col].to_numpy(dtype=float) for s in series]),
+            np.concatenate([s[y_col].to_numpy(dtype=float) for s in series]),
+        )
+        lengths = np.array([len(s) for s in series])
+        joins = np.ones(len(corners) - 1, dtype=bool)
+        joins[np.cumsum(lengths)[:-1] - 1] = False
+        segments = polyline_segments(corners[:-1][joins], corners[1:][joins])
+        offsets = np.concatenate([[0], np.cumsum(4 * np.maximum(lengths - 1, 0))])
+        for key, start, end in zip(keys, offsets[:-1], offsets[1:]):
+            self.points[key, y_col, layout] = segments[start:end]
+
+    def get_points(self, ax: Axes, key, y_col: str) -> np.ndarray:
+        self.place(ax, [key], y_col)
+        return self.points[key, y_col, axes_layout_key(ax)]
+
+    def line(self, ax: Axes, key, y_col: str, **kwargs) -> VMobject:
+        """A new VMobject (kwargs as for plot_line_graph's line) on the cached points"""
+        line = VMobject(**kwargs)
+        line.set_points(self.get_points(ax, key, y_col).copy())
+        return line
@@ -5,8 +5,27 @@ import numpy as np
 from utils import (
     get_scatter_df,
     create_country_group,
+    create_country_groups,
     add_binned_columns,
     add_kmeans_clusters,
+    WindowIndex,
+)
+from data_cache import read_csv_cached, panel_filters
+from spending_store import (
+    get_spending_scatter_df,
+    get_spending_panel_df,
+    iter_spending_scatter_years,
+    METRICS,
+)
+from scene_utils import (
+    coords_to_points,
+    make_dots,
+    scatter_state,
+    DotScatter,
+    ScatterTransform,
+    TextCounter,
+    RasterLayer,
+    LineGeometryCache,
 )
 
 ### Uncomment when switching to WHITE background
@@ -19,6 +38,14 @@ Axes.set_default(color=BLACK)
 
 np.random.seed(37)
 
+### Sections to render, comma separated (set by render_all.py); all when empty
+render_sections = [s for s in os.environ.get("RENDER_SECTIONS", "").split(",") if s]
+if render_sections:
+    ### Keep each section's partial movie files and file list apart from the others
+    config.partial_movie_dir = (
+        "{video_dir}/partial_movie_files/{scene_name}/" + "_".join(render_sections)
+    )
+
 ###################
 ### Definitions ###
 ###################
@@ -34,6 +61,27 @@ colour_map = {
     "World": "#1099D0",
 }
 
+### Countries left out of the scatter plots
+excluded_countries = [
+    "Kuwait",
+    "Qatar",
+    "Equatorial Guinea",
+    "Bulgaria",
+    "Azerbaijan",
+    "Hungary",
+    "Angola",
+]
+
+### Panel columns the scenes use
+panel_columns = [
+    "Year",
+    "Population",
+    "Country",
+    "GDP per capita (OWiD)",
+    "Government Expenditure (IMF, Wiki, Statistica)",
+    "Region",
+]
+
 ### Between 10s
 """ bin_groups = {
     5.0: [0.0, 10.0],
@@ -59,77 +107,70 @@ bin_groups = {
 
 
 ### Line graphs
-def get_spend_gdp_df() -> pd.DataFrame:
-    df = (
-        pd.read_csv(cwd + "/data/spending_and_gdp_per_capita.csv")
-        .drop(columns=["Unnamed: 0"])
-        .sort_values(["Country", "Year"])
-    )
+def get_spend_gdp_df(
+    columns: list = None, countries: list = None, years: list = None
+) -> pd.DataFrame:
+    df = read_csv_cached(
+        cwd + "/data/spending_and_gdp_per_capita.csv",
+        columns=columns,
+        filters=panel_filters(countries, years),
+        sort_by=["Country", "Year"],
+    ).drop(columns=["Unnamed: 0"], errors="ignore")
     return df
 
 
-def get_spend_gdp_debt_adjusted_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/spending_and_gdp_per_capita_debt_adjusted.csv"
-    ).sort_values(["Country", "Year"])
+def get_spend_gdp_debt_adjusted_df(
+    columns: list = None, countries: list = None, years: list = None
+) -> pd.DataFrame:
+    df = read_csv_cached(
+        cwd + "/data/spending_and_gdp_per_capita_debt_adjusted.csv",
+        columns=columns,
+        filters=panel_filters(countries, years),
+        sort_by=["Country", "Year"],
+    )
     return df
 
 
 def get_region_avg_spend_gdp_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/region_average_spending_and_gdp_per_capita.csv"
-    ).sort_values(["Country", "Year"])
+    df = get_spending_panel_df("none", "region").sort_values(["Country", "Year"])
     return df
 
 
 def get_region_avg_spend_gdp_debt_adjusted_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/region_average_spending_and_gdp_per_capita_debt_adjusted.csv"
-    ).sort_values(["Country", "Year"])
+    df = get_spending_panel_df("debt_adjusted", "region").sort_values(
+        ["Country", "Year"]
+    )
     return df
 
 
 ### Scatter graphs
 def get_avg_spend_avg_change_gdp_df() -> pd.DataFrame:
-    df = pd.read_csv(cwd + "/data/average_spend_vs_average_change_in_gdp.csv").drop(
-        columns=["Unnamed: 0"]
-    )
+    df = get_spending_scatter_df("average", "none", "country")
     return df
 
 
 def get_avg_spend_avg_change_gdp_debt_adjusted_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/average_spend_vs_average_change_in_gdp_debt_adjusted.csv"
-    ).drop(columns=["Unnamed: 0"])
+    df = get_spending_scatter_df("average", "debt_adjusted", "country")
     return df
 
 
 def get_avg_spend_ann_change_gdp_df() -> pd.DataFrame:
-    df = pd.read_csv(cwd + "/data/average_spend_vs_annualized_change_in_gdp.csv").drop(
-        columns=["Unnamed: 0"]
-    )
+    df = get_spending_scatter_df("annualized", "none", "country")
     return df
 
 
 def get_avg_spend_ann_change_gdp_debt_adjusted_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/average_spend_vs_annualized_change_in_gdp_debt_adjusted.csv"
-    ).drop(columns=["Unnamed: 0"])
+    df = get_spending_scatter_df("annualized", "debt_adjusted", "country")
     return df
 
 
 def get_rgn_avg_spend_rgn_avg_change_gdp_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd + "/data/region_average_spend_vs_region_average_change_in_gdp.csv"
-    ).drop(columns=["Unnamed: 0"])
+    df = get_spending_scatter_df("average", "none", "region")
     return df
 
 
 def get_rgn_avg_spend_rgn_avg_change_gdp_debt_adjusted_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        cwd
-        + "/data/region_average_spend_vs_region_average_change_in_gdp_debt_adjusted.csv"
-    ).drop(columns=["Unnamed: 0"])
+    df = get_spending_scatter_df("average", "debt_adjusted", "region")
     return df
 
 
@@ -149,6 +190,10 @@ def make_country_to_colour_map(df: pd.DataFrame) -> dict:
     return country_to_colour_map
 
 
+def section_name(country: str) -> str:
+    return country.lower().replace(" ", "_")
+
+
 def make_axes(
     x_range: list,
     y_range: list,
@@ -202,33 +247,27 @@ def make_axes(
 
 
 class SpendingVsGrowthAnimatedScene(Scene):
+    focus_countries = ["United States", "Japan", "G7"]
+    section_names = (
+        ["uk_demo"]
+        + [section_name(country) for country in focus_countries]
+        + ["war_years", "clusters"]
+    )
 
     def construct(self):
         ### Demo country
         demo_country = "United Kingdom"
-        focus_countries = ["United States", "Japan", "G7"]
-        excluded_countries = [
-            "Kuwait",
-            "Qatar",
-            "Equatorial Guinea",
-            "Bulgaria",
-            "Azerbaijan",
-            "Hungary",
-            "Angola",
-        ]
+        focus_countries = self.focus_countries
 
         ### Load data for line graphs and put in DataFrame
-        line_graphs_df = get_spend_gdp_df()
-        line_graphs_debt_adjusted_df = get_spend_gdp_debt_adjusted_df()
-        uk_line_graphs_debt_adjusted_df = line_graphs_debt_adjusted_df.loc[
-            line_graphs_debt_adjusted_df["Country"] == demo_country, :
-        ].set_index("Year", drop=False)
-        ### Don't bother calculating, just import from dashboard data
+        line_graphs_df = get_spend_gdp_df(columns=panel_columns)
+        line_graphs_debt_adjusted_df = get_spend_gdp_debt_adjusted_df(
+            columns=panel_columns
+        )
+        ### Region averages are quick to calculate live, but not needed because
+        ### we're not doing all Euopean countries now
         """ avg_line_graphs_df = make_region_avg_df(line_graphs_df, weight_pop=True)
         avg_line_graphs_debt_adjusted_df = make_region_avg_df(line_graphs_debt_adjusted_df, weight_pop=True) """
-        ### Don't even do that, because we're not doing all Euopean countries now
-        """ avg_line_graphs_df = get_region_avg_spend_gdp_df()
-        avg_line_graphs_debt_adjusted_df = get_region_avg_spend_gdp_debt_adjusted_df() """
         ### Add G7 countriesto the line graph data
         g7_countries = [
             "United States",
@@ -239,23 +278,17 @@ class SpendingVsGrowthAnimatedScene(Scene):
             "Italy",
             "Japan",
         ]
-        new_country_names = ["G7"]
-        new_region_names = ["World"]
-        for i, country_list in enumerate([g7_countries]):
-            line_graphs_df = create_country_group(
-                line_graphs_df,
-                countries=country_list,
-                new_country_name=new_country_names[i],
-                new_region_name=new_region_names[i],
-                weight_pop=True,
-            )
-            line_graphs_debt_adjusted_df = create_country_group(
-                line_graphs_debt_adjusted_df,
-                countries=country_list,
-                new_country_name=new_country_names[i],
-                new_region_name=new_region_names[i],
-                weight_pop=True,
-            )
+        country_groups = [(g7_countries, "G7", "World")]
+        line_graphs_df = create_country_groups(
+            line_graphs_df, country_groups, weight_pop=True
+        )
+        line_graphs_debt_adjusted_df = create_country_groups(
+            line_graphs_debt_adjusted_df, country_groups, weight_pop=True
+        )
+        ### Every country's line graph points, placed once per axes layout
+        line_geometry = LineGeometryCache(line_graphs_debt_adjusted_df)
+        gdp_col = "GDP per capita (OWiD)"
+        spend_col = "Government Expenditure (IMF, Wiki, Statistica)"
 
         ### Load data for scatter plot
         scatter_df = get_avg_spend_ann_change_gdp_df()
@@ -264,6 +297,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
         uk_scatter_debt_adjusted_df = scatter_debt_adjusted_df.loc[
             scatter_debt_adjusted_df["Country"] == demo_country, :
         ]
+        uk_window_index = WindowIndex(uk_scatter_debt_adjusted_df)
         ### Calculate scatter data for G7
         rgn_avg_scatter_df = get_scatter_df(
             line_graphs_df, long_range=[1850, 2022], sub_period=5
@@ -276,6 +310,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
         country_to_colour_map = make_country_to_colour_map(scatter_df)
 
         ### Generate axes and labels for gdp and spend
+        self.start_section("uk_demo")
         gdp_ax, gdp_x_label, gdp_y_label = self.generate_axes(
             x_range=[1840, 2023, 20],
             y_range=[3, 5, 1],
@@ -312,20 +347,18 @@ class SpendingVsGrowthAnimatedScene(Scene):
         stacked_plots_vgroup.arrange(UP, buff=1).scale_to_fit_height(6)
 
         ### Generate line plots and draw
-        gdp_line_graph = gdp_ax.plot_line_graph(
-            x_values=uk_line_graphs_debt_adjusted_df["Year"],
-            y_values=uk_line_graphs_debt_adjusted_df["GDP per capita (OWiD)"],
-            line_color=country_to_colour_map[demo_country],
-            add_vertex_dots=False,
+        gdp_line_graph = line_geometry.line(
+            gdp_ax,
+            demo_country,
+            gdp_col,
+            color=country_to_colour_map[demo_country],
             stroke_width=2,
         )
-        spend_line_graph = spend_ax.plot_line_graph(
-            x_values=uk_line_graphs_debt_adjusted_df["Year"],
-            y_values=uk_line_graphs_debt_adjusted_df[
-                "Government Expenditure (IMF, Wiki, Statistica)"
-            ],
-            line_color=country_to_colour_map[demo_country],
-            add_vertex_dots=False,
+        spend_line_graph = line_geometry.line(
+            spend_ax,
+            demo_country,
+            spend_col,
+            color=country_to_colour_map[demo_country],
             stroke_width=2,
         )
 
@@ -392,7 +425,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
             lambda: Dot(
                 comp_ax.coords_to_point(
                     *self.years_to_coords(
-                        uk_scatter_debt_adjusted_df,
+                        uk_window_index,
                         round(lower_vt.get_value()),
                         round(upper_vt.get_value()),
                     )
@@ -403,14 +436,11 @@ class SpendingVsGrowthAnimatedScene(Scene):
             )
         )
         ### Create year range display
-        year_text_range = always_redraw(
-            lambda: Text(
-                f"{int(lower_vt.get_value())} - {int(upper_vt.get_value())}",
-                font_size=14,
-                color=BLACK,
-            ).move_to(
-                comp_ax.c2p(70, -10)
-            )  # Position in bottom right corner
+        year_text_range = TextCounter(
+            lambda: f"{int(lower_vt.get_value())} - {int(upper_vt.get_value())}",
+            position=comp_ax.c2p(70, -10),  # Position in bottom right corner
+            font_size=14,
+            color=BLACK,
         )
 
         ### Write the projected lines and demo point to the scene
@@ -442,23 +472,18 @@ class SpendingVsGrowthAnimatedScene(Scene):
         )
 
         ### Generate list of dots and add to scene while value tracker changes
-        demo_dots_list = []
-        for lower_bound in list(range(1850, 2018)):
-            upper_bound = lower_bound + 5
-            demo_dots_list.append(
-                Dot(
-                    comp_ax.coords_to_point(
-                        *self.years_to_coords(
-                            uk_scatter_debt_adjusted_df,
-                            lower_bound,
-                            upper_bound,
-                        )
-                    ),
-                    color=country_to_colour_map[demo_country],
-                    radius=0.05,
-                    fill_opacity=0.3,
-                )
-            )
+        demo_coords = np.array(
+            [
+                self.years_to_coords(uk_window_index, lower_bound, lower_bound + 5)
+                for lower_bound in range(1850, 2018)
+            ]
+        )
+        demo_dots_list = make_dots(
+            coords_to_points(comp_ax, demo_coords[:, 0], demo_coords[:, 1]),
+            country_to_colour_map[demo_country],
+            radii=0.05,
+            fill_opacity=0.3,
+        )
         self.play(
             lower_vt.animate.set_value(2017),
             upper_vt.animate.set_value(2022),
@@ -491,6 +516,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
 
         ### Do the same animation for selected countries
         for fc, focus_country in enumerate(focus_countries):
+            self.start_section(section_name(focus_country))
             if focus_country in ["G7"]:
                 fc_scatter_debt_adjusted_df = rgn_avg_debt_adjusted_scatter_df.copy()
                 cmap = colour_map
@@ -498,33 +524,25 @@ class SpendingVsGrowthAnimatedScene(Scene):
                 fc_scatter_debt_adjusted_df = scatter_debt_adjusted_df.copy()
                 cmap = country_to_colour_map
 
-            fc_line_graphs_debt_adjusted_df = line_graphs_debt_adjusted_df.copy()
-
-            ### Create dfs for line plots
-            fc_line_graphs_debt_adjusted_df = fc_line_graphs_debt_adjusted_df.loc[
-                fc_line_graphs_debt_adjusted_df["Country"] == focus_country, :
-            ].set_index("Year", drop=False)
-
             ### Create dfs for scatter plots
             fc_scatter_debt_adjusted_df = fc_scatter_debt_adjusted_df.loc[
                 fc_scatter_debt_adjusted_df["Country"] == focus_country, :
             ]
+            fc_window_index = WindowIndex(fc_scatter_debt_adjusted_df)
 
             ### Generate line plots and draw
-            gdp_line_graph = gdp_ax.plot_line_graph(
-                x_values=fc_line_graphs_debt_adjusted_df["Year"],
-                y_values=fc_line_graphs_debt_adjusted_df["GDP per capita (OWiD)"],
-                line_color=cmap[focus_country],
-                add_vertex_dots=False,
+            gdp_line_graph = line_geometry.line(
+                gdp_ax,
+                focus_country,
+                gdp_col,
+                color=cmap[focus_country],
                 stroke_width=2,
             )
-            spend_line_graph = spend_ax.plot_line_graph(
-                x_values=fc_line_graphs_debt_adjusted_df["Year"],
-                y_values=fc_line_graphs_debt_adjusted_df[
-                    "Government Expenditure (IMF, Wiki, Statistica)"
-                ],
-                line_color=cmap[focus_country],
-                add_vertex_dots=False,
+            spend_line_graph = line_geometry.line(
+                spend_ax,
+                focus_country,
+                spend_col,
+                color=cmap[focus_country],
                 stroke_width=2,
             )
 
@@ -540,24 +558,18 @@ class SpendingVsGrowthAnimatedScene(Scene):
                 for country in g7_countries:
                     if country in excluded_countries:
                         continue
-                    country_lines_graph_df = line_graphs_debt_adjusted_df.loc[
-                        line_graphs_debt_adjusted_df["Country"] == country, :
-                    ].set_index("Year", drop=False)
-
-                    gdp_lines_dict[country] = gdp_ax.plot_line_graph(
-                        x_values=country_lines_graph_df["Year"],
-                        y_values=country_lines_graph_df["GDP per capita (OWiD)"],
-                        line_color=country_to_colour_map[country],
-                        add_vertex_dots=False,
+                    gdp_lines_dict[country] = line_geometry.line(
+                        gdp_ax,
+                        country,
+                        gdp_col,
+                        color=country_to_colour_map[country],
                         stroke_width=1,
                     )
-                    spend_lines_dict[country] = spend_ax.plot_line_graph(
-                        x_values=country_lines_graph_df["Year"],
-                        y_values=country_lines_graph_df[
-                            "Government Expenditure (IMF, Wiki, Statistica)"
-                        ],
-                        line_color=country_to_colour_map[country],
-                        add_vertex_dots=False,
+                    spend_lines_dict[country] = line_geometry.line(
+                        spend_ax,
+                        country,
+                        spend_col,
+                        color=country_to_colour_map[country],
                         stroke_width=1,
                     )
 
@@ -639,7 +651,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
                 lambda: Dot(
                     comp_ax.coords_to_point(
                         *self.years_to_coords(
-                            fc_scatter_debt_adjusted_df,
+                            fc_window_index,
                             round(lower_vt.get_value()),
                             round(upper_vt.get_value()),
                         )
@@ -659,23 +671,18 @@ class SpendingVsGrowthAnimatedScene(Scene):
             self.wait()
 
             ### Generate list of dots and add to scene while value tracker changes
-            demo_dots_list = []
-            for lower_bound in list(range(initial_start_year, 2018)):
-                upper_bound = lower_bound + 5
-                demo_dots_list.append(
-                    Dot(
-                        comp_ax.coords_to_point(
-                            *self.years_to_coords(
-                                fc_scatter_debt_adjusted_df,
-                                lower_bound,
-                                upper_bound,
-                            )
-                        ),
-                        color=cmap[focus_country],
-                        radius=0.05,
-                        fill_opacity=0.3,
-                    )
-                )
+            demo_coords = np.array(
+                [
+                    self.years_to_coords(fc_window_index, lower_bound, lower_bound + 5)
+                    for lower_bound in range(initial_start_year, 2018)
+                ]
+            )
+            demo_dots_list = make_dots(
+                coords_to_points(comp_ax, demo_coords[:, 0], demo_coords[:, 1]),
+                cmap[focus_country],
+                radii=0.05,
+                fill_opacity=0.3,
+            )
             self.play(
                 lower_vt.animate.set_value(2017),
                 upper_vt.animate.set_value(2022),
@@ -744,6 +751,7 @@ class SpendingVsGrowthAnimatedScene(Scene):
             rect_list.append(rect)
 
         ### "Remove" war years from all plots
+        self.start_section("war_years")
         self.play(
             *[Create(r) for r in rect_list],
             *[Unwrite(d) for d in demo_dots_war_years],
@@ -763,18 +771,19 @@ class SpendingVsGrowthAnimatedScene(Scene):
 
         ### Add clustering results to dataframe
         fc_scatter_debt_adjusted_df = add_kmeans_clusters(
-            fc_scatter_debt_adjusted_df, n_clusters=5
+            fc_scatter_debt_adjusted_df, n_clusters=5, countries=[focus_country]
         )
+        fc_window_index = WindowIndex(fc_scatter_debt_adjusted_df)
 
         ### Transform current scatter plot to centroid scatter plot
-        centroid_dots_list = []
+        centroid_coords, centroid_opacities = [], []
         seen_coords = []
         for lower_bound in list(range(initial_start_year, 2018)):
             if lower_bound in war_years:
                 continue
             upper_bound = lower_bound + 5
             coords = self.years_to_coords(
-                fc_scatter_debt_adjusted_df,
+                fc_window_index,
                 lower_bound,
                 upper_bound,
                 which_data="centroid",
@@ -785,16 +794,18 @@ class SpendingVsGrowthAnimatedScene(Scene):
                 fill_opacity = 0.75
             else:
                 fill_opacity = 0.0
-            centroid_dots_list.append(
-                Dot(
-                    comp_ax.coords_to_point(*coords),
-                    color=colour_map[focus_country],
-                    radius=0.05,
-                    fill_opacity=fill_opacity,
-                )
-            )
+            centroid_coords.append(coords)
+            centroid_opacities.append(fill_opacity)
+        centroid_coords = np.array(centroid_coords)
+        centroid_dots_list = make_dots(
+            coords_to_points(comp_ax, centroid_coords[:, 0], centroid_coords[:, 1]),
+            cmap[focus_country],
+            radii=0.05,
+            fill_opacity=centroid_opacities,
+        )
 
         ### Finally, animate the transformations
+        self.start_section("clusters")
         self.play(
             *[
                 ReplacementTransform(d, centroid_dots_list[i])
@@ -804,6 +815,17 @@ class SpendingVsGrowthAnimatedScene(Scene):
         )
         self.wait(2)
 
+    def start_section(self, name: str):
+        """Cut a new section, skipping its animations when RENDER_SECTIONS excludes it.
+
+        Skipped sections still run, so later sections start from the right
+        state; render_all.py renders the sections in parallel processes and
+        concatenates them.
+        """
+        self.next_section(
+            name, skip_animations=bool(render_sections) and name not in render_sections
+        )
+
     def get_rectangle_corners(self, bottom_left, top_right):
         return [
             (top_right[0], top_right[1]),
@@ -813,27 +835,13 @@ class SpendingVsGrowthAnimatedScene(Scene):
         ]
 
     def years_to_coords(
-        self, df: pd.DataFrame, start_year: int, end_year: int, which_data: str = None
+        self,
+        window_index: WindowIndex,
+        start_year: int,
+        end_year: int,
+        which_data: str = None,
     ) -> list[float, float]:
-        if abs(end_year - start_year) != 5:
-            end_year = start_year + 5
-        if which_data == "centroid":
-            col_names = ["centroid_x", "centroid_y"]
-        else:
-            col_names = [
-                "Average Government Expenditure as % of GDP",
-                "Annualized percentage change in GDP per capita USD",
-            ]
-        result = df.loc[
-            (df["start_year"] == start_year) & (df["end_year"] == end_year),
-            col_names,
-        ]
-        if result.empty:
-            raise ValueError(
-                f"No data found for start_year={start_year} and end_year={end_year}"
-            )
-        coords = result.values[0]
-        return coords
+        return window_index.lookup(start_year, end_year, which_data=which_data)
 
     def generate_axes(
         self,
@@ -887,6 +895,211 @@ class SpendingVsGrowthAnimatedScene(Scene):
         return ax, x_label, y_label
 
 
+class AllCountriesSpendingVsGrowthScene(SpendingVsGrowthAnimatedScene):
+    """Every country's spend and GDP lines merged into their region averages,
+    then the averages' windows swept onto the spend vs growth axes.
+
+    Country lines are placed by a LineGeometryCache and only live for the
+    plays that draw and merge them, after which one line per region remains.
+    Windows are streamed a start year at a time from the spending store: the
+    current window is live dots, and is stamped into a RasterLayer once
+    drawn, so memory and per-frame cost stay bounded however many countries
+    and years the panel holds. Set aggregation = "country" to sweep every
+    country's windows instead of the region averages.
+    """
+
+    section_names = None
+    aggregation = "region"
+    metric = "average"
+    seconds_per_year = 0.1
+    x_col = "Average Government Expenditure as % of GDP"
+
+    def construct(self):
+        gdp_col = "GDP per capita (OWiD)"
+        spend_col = "Government Expenditure (IMF, Wiki, Statistica)"
+        y_col = METRICS[self.metric]
+
+        ### Load every country's lines and the region averages they merge into
+        line_graphs_df = get_spend_gdp_df(columns=panel_columns)
+        line_graphs_df = line_graphs_df.loc[
+            ~line_graphs_df["Country"].isin(excluded_countries), :
+        ]
+        country_geometry = LineGeometryCache(line_graphs_df)
+        region_geometry = LineGeometryCache(get_region_avg_spend_gdp_df())
+        countries = list(country_geometry.series)
+        country_to_colour_map = make_country_to_colour_map(line_graphs_df)
+        country_to_region_map = dict(
+            zip(line_graphs_df["Country"], line_graphs_df["Region"])
+        )
+        regions = sorted(set(country_to_region_map.values()))
+
+        ### Generate axes and labels for gdp and spend, stacked on the left
+        gdp_ax, gdp_x_label, gdp_y_label = self.generate_axes(
+            x_range=[1840, 2023, 20],
+            y_range=[3, 5, 1],
+            x_numbers_to_include=list(range(1860, 2023, 20)),
+            y_numbers_to_include=list(range(3, 6, 1)),
+            log_y=True,
+            animate_axes=False,
+            x_axis_label="Year",
+            y_axis_label="GDP per capita (USD)",
+            font_size=26,
+            x_length=12,
+            y_length=6,
+        )
+        spend_ax, spend_x_label, spend_y_label = self.generate_axes(
+            x_range=[1840, 2023, 20],
+            y_range=[0, 101, 10],
+            x_numbers_to_include=list(range(1860, 2023, 20)),
+            y_numbers_to_include=list(range(0, 100, 20)),
+            log_y=False,
+            animate_axes=False,
+            x_axis_label="Year",
+            y_axis_label="Gover nment Expenditure (%)",
+            font_size=26,
+            x_length=12,
+            y_length=6,
+        )
+        stacked_plots_vgroup = VGroup(
+            VGroup(spend_ax, spend_x_label, spend_y_label),
+            VGroup(gdp_ax, gdp_x_label, gdp_y_label),
+        )
+        stacked_plots_vgroup.arrange(UP, buff=1).scale_to_fit_height(6)
+        stacked_plots_vgroup.shift(LEFT * 4.33)
+
+        ### Draw composite axes to right
+        comp_ax, comp_x_label, comp_y_label = self.generate_axes(
+            x_range=[0, 81, 10],
+            y_range=[-11, 16, 5],
+            x_numbers_to_include=list(range(0, 81, 10)),
+            y_numbers_to_include=list(range(-10, 16, 5)),
+            log_y=False,
+            animate_axes=True,
+            x_axis_label="Average Gover nment Expenditure (%)",
+            y_axis_label="Gr owth - Change in GDP per capita (%)",
+            font_size=14,
+            x_length=14,
+            y_length=12,
+            position=2.0,
+            scale=0.5,
+        )
+
+        ### Draw all country lines on left plots, in random order; each axes'
+        ### lines are placed in one batch before the VMobjects are made
+        line_axes = [(spend_ax, spend_col), (gdp_ax, gdp_col)]
+        for ax, col in line_axes:
+            country_geometry.place(ax, countries, col)
+        country_lines = {
+            (ax, country): country_geometry.line(
+                ax,
+                country,
+                col,
+                color=country_to_colour_map[country],
+                stroke_width=1,
+            )
+            for ax, col in line_axes
+            for country in countries
+        }
+        lines = list(country_lines.values())
+        self.play(
+            LaggedStart(
+                *[Write(lines[i]) for i in np.random.permutation(len(lines))],
+                lag_ratio=0.05,
+                run_time=6.5,
+                rate_func=rate_functions.smooth,
+            )
+        )
+        self.wait()
+
+        ### Transform lines to weighted region average lines
+        region_lines = {
+            (ax, region): region_geometry.line(
+                ax, region + "_avg", col, color=colour_map[region], stroke_width=1
+            )
+            for ax, col in line_axes
+            for region in regions
+        }
+        self.play(
+            *[
+                Transform(line, region_lines[ax, country_to_region_map[country]])
+                for (ax, country), line in country_lines.items()
+            ],
+            run_time=1,
+        )
+        ### Merged lines all trace their region's average, so keep one per region
+        self.remove(*lines)
+        self.add(*region_lines.values())
+        del country_lines, lines
+        self.wait()
+
+        ### Create the lines that connect both graphs, starting at 1850
+        lower_vt = ValueTracker(1850)
+        upper_vt = ValueTracker(1855)
+        lower_projecting_line = self.projecting_line(gdp_ax, spend_ax, lower_vt)
+        upper_projecting_line = self.projecting_line(gdp_ax, spend_ax, upper_vt)
+        self.play(
+            Write(lower_projecting_line, run_time=1.0),
+            Write(upper_projecting_line, run_time=1.0),
+        )
+        self.wait()
+
+        ### Sweep the lines and plot each window's dots on the right, stamping
+        ### them into the history layer under the axes once drawn
+        history = RasterLayer()
+        self.add(history)
+        self.bring_to_back(history)
+        for start_year, window_df in iter_spending_scatter_years(
+            self.metric,
+            "none",
+            self.aggregation,
+            columns=["Country", "Region", self.x_col, y_col],
+        ):
+            points, colours = self.window_points(comp_ax, window_df, y_col)
+            dots = DotScatter(scatter_state(points, colours, 0.05, 0.0))
+            self.add(dots)
+            self.play(
+                ScatterTransform(dots, scatter_state(points, colours, 0.05, 0.3)),
+                lower_vt.animate.set_value(start_year),
+                upper_vt.animate.set_value(start_year + 5),
+                run_time=self.seconds_per_year,
+                rate_func=linear,
+            )
+            history.stamp(points, colours, 0.05, 0.3)
+            self.remove(dots)
+
+        ### Unwrite the projected lines
+        self.play(
+            Unwrite(lower_projecting_line, run_time=1.0),
+            Unwrite(upper_projecting_line, run_time=1.0),
+        )
+        self.wait(2)
+
+    def projecting_line(
+        self, gdp_ax: Axes, spend_ax: Axes, year_vt: ValueTracker
+    ) -> DashedLine:
+        """Dashed line from the bottom of spend_ax to the top of gdp_ax at the
+        tracked year, moved sideways each frame rather than rebuilt"""
+        line = DashedLine(
+            color=YELLOW,
+            end=gdp_ax.c2p(year_vt.get_value(), 10e4),
+            start=spend_ax.c2p(year_vt.get_value(), 0),
+        )
+        line.add_updater(lambda m: m.set_x(gdp_ax.c2p(year_vt.get_value(), 10e4)[0]))
+        return line
+
+    def window_points(self, ax: Axes, window_df: pd.DataFrame, y_col: str) -> tuple:
+        """Scene points and colours of a window's rows that fall inside ax"""
+        visible = (
+            window_df[self.x_col].between(*ax.x_range[:2])
+            & window_df[y_col].between(*ax.y_range[:2])
+            & ~window_df["Country"].isin(excluded_countries)
+        )
+        window_df = window_df.loc[visible, :]
+        points = coords_to_points(ax, window_df[self.x_col], window_df[y_col])
+        colours = window_df["Region"].astype(str).map(colour_map).tolist()
+        return points, colours
+
+
 if __name__ == "__main__":
     df = get_spend_gdp_debt_adjusted_df()
     countries = [
@@ -1,6 +1,8 @@
 from manim import *
 import pandas as pd
 import os
+from data_cache import read_csv_cached, panel_filters
+from scene_utils import RangeAxes
 
 ###################
 ### Definitions ###
@@ -20,24 +22,20 @@ colour_map = {
 ### Functions ###
 #################
 
-def get_spend_gdp_df() -> pd.DataFrame:
-    df = (
-        pd.read_csv(cwd + "/data/spending_and_gdp_per_capita.csv")
-        .drop(columns=["Unnamed: 0"])
-        .sort_values(["Country", "Year"])
-    )
+def get_spend_gdp_df(
+    columns: list = None, countries: list = None, years: list = None
+) -> pd.DataFrame:
+    df = read_csv_cached(
+        cwd + "/data/spending_and_gdp_per_capita.csv",
+        columns=columns,
+        filters=panel_filters(countries, years),
+        sort_by=["Country", "Year"],
+    ).drop(columns=["Unnamed: 0"], errors="ignore")
     ### Convert to K$s
     df["GDP per capita (OWiD)"] = df["GDP per capita (OWiD)"].div(1000)
     return df
 
 
-def get_avg_spend_change_gdp_df() -> pd.DataFrame:
-    df = (
-        pd.read_csv(cwd + "/data/average_spend_vs_change_in_gdp.csv")
-        .drop(columns=["Unnamed: 0"])
-    )
-    return df
-
 def add_radius_col(
     df: pd.DataFrame, lowest_radius: float, highest_radius: float
 ) -> pd.DataFrame:
@@ -72,41 +70,28 @@ class SpendingAnimatedScene(Scene):
         #########################
 
         ### Load data for line graphs and put in DataFrame
-        line_graphs_df = get_spend_gdp_df()
+        line_graphs_df = get_spend_gdp_df(countries=["United Kingdom"])
         uk_line_graphs_df = line_graphs_df.loc[line_graphs_df["Country"] == "United Kingdom", :].set_index("Year", drop=False)
 
-        ### Make axis function and generate
-        def make_ax():
-            ax = Axes(
-                 x_range=[x_min.get_value(), 2021, 10],
-                 y_range=[0, 101, 10],
-                 x_length=12,
-                 y_length=6,
-                 axis_config={
-                      "color": WHITE,  # <- not needed if backgroud colour is default BLACK
-                      "include_tip": False,
-                      "include_numbers": False,
-                      "decimal_number_config": {
-                           "num_decimal_places": 0,
-                           "group_with_commas": False,  # <- This removes the comma delimitation
-                        },
-                    },
-                    x_axis_config={"numbers_to_include": list(range(1860, 2021, 20))},
-                    y_axis_config={"numbers_to_include": list(range(0, 100, 20))},
-            )
-            return ax
-        ax = make_ax()
-        
-        ### Define axis updater function and add to axis object
-        def axis_updater(mob):
-            old_ax = mob
-            new_ax = make_ax()
-            old_ax.become(new_ax)
-            old_ax.x_axis.x_range = new_ax.x_axis.x_range
-            old_ax.x_axis.scaling = new_ax.x_axis.scaling
-            old_ax.y_axis.x_range = new_ax.y_axis.x_range
-            old_ax.y_axis.scaling = new_ax.y_axis.scaling
-        ax.add_updater(axis_updater)
+        ### Make axis, with its x range following x_min
+        ax = RangeAxes(
+            x_range=[x_min.get_value(), 2021, 10],
+            y_range=[0, 101, 10],
+            x_length=12,
+            y_length=6,
+            axis_config={
+                "color": WHITE,  # <- not needed if backgroud colour is default BLACK
+                "include_tip": False,
+                "include_numbers": False,
+                "decimal_number_config": {
+                    "num_decimal_places": 0,
+                    "group_with_commas": False,  # <- This removes the comma delimitation
+                },
+            },
+            x_axis_config={"numbers_to_include": list(range(1860, 2021, 20))},
+            y_axis_config={"numbers_to_include": list(range(0, 100, 20))},
+        )
+        ax.follow_ranges(x_range=lambda: [x_min.get_value(), 2021, 10])
 
         ### Make line function and generate line object
         line = ax.plot_line_graph(
@@ -0,0 +1,214 @@
+import os
+import pandas as pd
+from data_cache import (
+    CACHE_DIR_NAME,
+    cached_signature,
+    read_csv_cached,
+    read_meta,
+    write_atomic,
+    write_meta,
+)
+from utils import get_scatter_df, make_region_avg_df
+
+###################
+### Definitions ###
+###################
+
+cwd = os.getcwd()
+STORE_DIR = os.path.join(cwd, "data", CACHE_DIR_NAME, "spending_store")
+LONG_RANGE = [1850, 2022]
+### Bump when the way tables are derived changes, to rebuild them all
+STORE_VERSION = 2
+
+### Source panel per adjustment, and the columns the tables are derived from
+SOURCES = {
+    "none": cwd + "/data/spending_and_gdp_per_capita.csv",
+    "debt_adjusted": cwd + "/data/spending_and_gdp_per_capita_debt_adjusted.csv",
+}
+PANEL_COLUMNS = [
+    "Year",
+    "Population",
+    "Country",
+    "GDP per capita (OWiD)",
+    "Government Expenditure (IMF, Wiki, Statistica)",
+    "Region",
+    "Subregion",
+]
+### Growth column per metric, named as in the old CSV exports
+METRICS = {
+    "average": "Average percentage change in GDP per capita USD",
+    "annualized": "Annualized percentage change in GDP per capita USD",
+}
+### make_region_avg_df weight_pop per aggregation, None for per-country rows
+AGGREGATIONS = {
+    "country": None,
+    "region": True,
+    "region_unweighted": False,
+}
+
+#################
+### Functions ###
+#################
+
+
+def read_source_panel(adjustment: str) -> pd.DataFrame:
+    return read_csv_cached(
+        SOURCES[adjustment], columns=PANEL_COLUMNS, sort_by=["Country", "Year"]
+    )
+
+
+def build_panel(adjustment: str, aggregation: str) -> pd.DataFrame:
+    df = read_source_panel(adjustment)
+    if AGGREGATIONS[aggregation] is not None:
+        df = make_region_avg_df(df, weight_pop=AGGREGATIONS[aggregation])
+    return df
+
+
+def build_scatter(
+    metric: str, adjustment: str, aggregation: str, window: int
+) -> pd.DataFrame:
+    df = get_scatter_df(
+        build_panel(adjustment, aggregation), LONG_RANGE, window, growth_metric=metric
+    )
+    return df.rename(
+        columns={"Annualized percentage change in GDP per capita USD": METRICS[metric]}
+    )
+
+
+def table_path(name: str) -> str:
+    return os.path.join(STORE_DIR, name + ".parquet")
+
+
+def ensure_table(
+    name: str, adjustment: str, build_func, sort_column: str = "Country"
+) -> str:
+    """Path of a stored table, (re)built when its source panel's hash or STORE_VERSION changed.
+
+    Tables are written sorted by sort_column in small row groups, so reading
+    a few countries (or start years) with a filter only decodes the row
+    groups holding them.
+    """
+    path = table_path(name)
+    meta = {
+        "sha256": cached_signature(SOURCES[adjustment])["sha256"],
+        "version": STORE_VERSION,
+    }
+    if os.path.exists(path) and read_meta(path + ".json") == meta:
+        return path
+
+    df = build_func()
+    df = df.assign(store_row=range(len(df))).sort_values(sort_column, kind="stable")
+    os.makedirs(STORE_DIR, exist_ok=True)
+    write_atomic(
+        path,
+        lambda tmp_path: df.to_parquet(tmp_path, index=False, row_group_size=1024),
+    )
+    write_meta(path + ".json", meta)
+    return path
+
+
+def read_table(
+    path: str, countries: list = None, columns: list = None, filters: list = None
+):
+    filters = list(filters or [])
+    if countries:
+        filters.append(("Country", "in", list(countries)))
+    filters = filters or None
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ["store_row"]))
+    df = pd.read_parquet(path, columns=columns, filters=filters)
+    if countries is not None and not len(countries):
+        df = df.iloc[:0]
+    ### Back to the order the table was built in
+    return df.sort_values("store_row").drop(columns="store_row").reset_index(drop=True)
+
+
+def scatter_table(
+    metric: str,
+    adjustment: str,
+    aggregation: str,
+    window: int,
+    sort_column: str = "Country",
+) -> str:
+    name = "scatter-{0}-{1}-{2}-{3}".format(metric, adjustment, aggregation, window)
+    if sort_column != "Country":
+        name += "-by-" + sort_column
+    return ensure_table(
+        name,
+        adjustment,
+        lambda: build_scatter(metric, adjustment, aggregation, window),
+        sort_column,
+    )
+
+
+def panel_table(adjustment: str, aggregation: str) -> str:
+    return ensure_table(
+        "panel-{0}-{1}".format(adjustment, aggregation),
+        adjustment,
+        lambda: build_panel(adjustment, aggregation),
+    )
+
+
+def get_spending_scatter_df(
+    metric: str = "annualized",
+    adjustment: str = "none",
+    aggregation: str = "country",
+    window: int = 5,
+    countries: list = None,
+    columns: list = None,
+) -> pd.DataFrame:
+    """Average spend vs GDP growth for every window-year period since 1850.
+
+    metric is "average" or "annualized" growth, adjustment "none" or
+    "debt_adjusted", aggregation "country", "region" (population weighted)
+    or "region_unweighted". Pass countries and/or columns to load only that
+    slice of the stored table.
+    """
+    path = scatter_table(metric, adjustment, aggregation, window)
+    return read_table(path, countries, columns)
+
+
+def iter_spending_scatter_years(
+    metric: str = "annualized",
+    adjustment: str = "none",
+    aggregation: str = "country",
+    window: int = 5,
+    columns: list = None,
+):
+    """Yield (start_year, rows of that window) in year order.
+
+    Reads a copy of the scatter table sorted by start_year, one year at a
+    time, so memory is bounded by one window's rows however large the
+    table grows.
+    """
+    path = scatter_table(metric, adjustment, aggregation, window, "start_year")
+    start_years = pd.read_parquet(path, columns=["start_year"])["start_year"]
+    for start_year in sorted(start_years.unique()):
+        yield start_year, read_table(
+            path, columns=columns, filters=[("start_year", "==", start_year)]
+        )
+
+
+def get_spending_panel_df(
+    adjustment: str = "none",
+    aggregation: str = "region",
+    countries: list = None,
+    columns: list = None,
+) -> pd.DataFrame:
+    """Yearly spend and GDP per capita panel, per country or region average"""
+    return read_table(panel_table(adjustment, aggregation), countries, columns)
+
+
+def build_spending_store(windows: list = (5,)) -> None:
+    """Build every stored table whose source panel changed since it was written"""
+    for adjustment in SOURCES:
+        for aggregation in AGGREGATIONS:
+            panel_table(adjustment, aggregation)
+            for metric in METRICS:
+                for window in windows:
+                    scatter_table(metric, adjustment, aggregation, window)
+
+
+if __name__ == "__main__":
+    build_spending_store()
+    print(sorted(os.listdir(STORE_DIR)))
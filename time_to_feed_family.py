@@ -1,6 +1,8 @@
 from manim import *
 import pandas as pd
 import os
+from data_cache import read_csv_cached
+from scene_utils import coords_to_points, RangeAxes
 
 ###################
 ### Definitions ###
@@ -24,7 +26,7 @@ cwd = os.getcwd()
 
 def get_time_to_feed_family_df() -> pd.DataFrame:
     """Simple utility function to read the time to feed family data with yearly interpolation"""
-    df = pd.read_csv(cwd + "/data/time_to_feed_family.csv")
+    df = read_csv_cached(cwd + "/data/time_to_feed_family.csv")
 
     # Create complete year range from min to max year
     min_year = df["Year"].min()
@@ -55,9 +57,10 @@ class LineGraphAxis(object):
 
     def make_axis(self):
         x_max_val = self._x_max.get_value()
-        ax = Axes(
+        ax = RangeAxes(
             x_range=[self._x_min, x_max_val, self.x_step],
             y_range=[0, self._y_max, self.y_step],
+            label_color=BLACK,
             axis_config={
                 "color": BLACK,
                 "include_tip": False,
@@ -67,37 +70,16 @@ class LineGraphAxis(object):
                     "group_with_commas": False,
                 },
             },
-            x_axis_config={
-                "numbers_to_include": np.arange(
-                    self._x_min, x_max_val + 1, self.x_step
-                ),
-            },
-            y_axis_config={
-                "numbers_to_include": np.arange(0, self._y_max + 1, self.y_step),
-            },
         )
-        # Add coordinates and make them visible
-        ax.add_coordinates()
-        ax.coordinate_labels[0].set_color(BLACK)
-        ax.coordinate_labels[1].set_color(BLACK)
         return ax
 
     def make_graph(self):
+        # Only the x range moves: the ticks slide along and labels come from
+        # a cache, instead of a new Axes being built every frame
         ax = self.make_axis()
-
-        def become_ax(mob):
-            old_ax = mob
-            new_ax = self.make_axis()
-            old_ax.become(new_ax)
-
-            # Copy additional properties that are not
-            # copied with .become()
-            old_ax.x_axis.x_range = new_ax.x_axis.x_range
-            old_ax.x_axis.scaling = new_ax.x_axis.scaling
-            old_ax.y_axis.x_range = new_ax.y_axis.x_range
-            old_ax.y_axis.scaling = new_ax.y_axis.scaling
-
-        ax.add_updater(become_ax)
+        ax.follow_ranges(
+            x_range=lambda: [self._x_min, self._x_max.get_value(), self.x_step]
+        )
         return ax
 
     def update_x_max(self, x_max):
@@ -107,61 +89,63 @@ class LineGraphAxis(object):
 class LineGraphLine(object):
     def __init__(self, ax, x_start, y_start):
         self.ax = ax
-        self.x_points = [x_start]
-        self.y_points = [y_start]
+        # Saved points in data coordinates, one (x, y) row each
+        self.coords = np.array([[x_start, y_start]], dtype=float)
+        self.axis_ranges = None
         self.line = self.plot_line()
 
         # From add_batch
-        self.new_x_batch = None
-        self.new_y_batch = None
+        self.new_batch = None
         self.segment_batch = None
 
+    def get_axis_ranges(self):
+        return tuple(tuple(axis.x_range) for axis in self.ax.axes)
+
     def make_line(self):
         # Take the saved points and build a line graph connecting them.
-        line = VGroup()
-
-        if len(self.x_points) > 1:
-            points = [self.ax.c2p(x, y) for x, y in zip(self.x_points, self.y_points)]
-            line.set_points_as_corners(points)
-            line.set_stroke(color=GRAY, width=2)
-
+        line = VMobject()
+        line.set_stroke(color=GRAY, width=2)
+        self.set_line_points(line)
         return line
 
+    def set_line_points(self, line):
+        self.axis_ranges = self.get_axis_ranges()
+        if len(self.coords) > 1:
+            # One vectorized transform from data to scene coordinates
+            line.set_points_as_corners(
+                coords_to_points(self.ax, self.coords[:, 0], self.coords[:, 1])
+            )
+        else:
+            line.clear_points()
+
     def plot_line(self):
         # Make the line and add an updater, which will keep the
         # points in sync with the axis.
         line = self.make_line()
 
         def line_updater(mob):
-            mob.become(self.make_line())
+            if self.get_axis_ranges() != self.axis_ranges:
+                self.set_line_points(mob)
 
         line.add_updater(line_updater)
 
         return line
 
     def add_batch(self, x_batch, y_batch):
-        # Create line segments for a batch of points
-        # Save the points to temporary values so they can be
-        # added to the array when save_batch() is called.
-        self.new_x_batch = x_batch
-        self.new_y_batch = y_batch
-
-        # Create all the line segments for this batch
-        segments = VGroup()
-
-        # Start from the last existing point
-        prev_x = self.x_points[-1]
-        prev_y = self.y_points[-1]
-
-        for x, y in zip(x_batch, y_batch):
-            start = self.ax.c2p(prev_x, prev_y)
-            end = self.ax.c2p(x, y)
-            segment = Line(start, end, color=GRAY, stroke_width=2)
-            segments.add(segment)
-
-            # Update previous point for next segment
-            prev_x = x
-            prev_y = y
+        # Create one path for a batch of points, starting from the last
+        # existing point, which Create draws progressively. The points are
+        # kept so they can be added to the array when save_batch() is called.
+        self.new_batch = np.column_stack([x_batch, y_batch]).astype(float)
+
+        segments = VMobject()
+        segments.set_points_as_corners(
+            coords_to_points(
+                self.ax,
+                np.concatenate([self.coords[-1:, 0], self.new_batch[:, 0]]),
+                np.concatenate([self.coords[-1:, 1], self.new_batch[:, 1]]),
+            )
+        )
+        segments.set_stroke(color=GRAY, width=2)
 
         self.segment_batch = segments
         return segments
@@ -170,8 +154,8 @@ class LineGraphLine(object):
         # Save the batch points to the array and
         # return the segments so they can be
         # removed from the scene.
-        self.x_points.extend(self.new_x_batch)
-        self.y_points.extend(self.new_y_batch)
+        self.coords = np.concatenate([self.coords, self.new_batch])
+        self.axis_ranges = None
         return self.segment_batch
 
 
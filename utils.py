@@ -1,7 +1,15 @@
+import os
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
+from data_cache import CACHE_DIR_NAME, frame_sha256, read_memoized
+
+KMEANS_COLUMNS = [
+    "Average Government Expenditure as % of GDP",
+    "Annualized percentage change in GDP per capita USD",
+]
 
 
 def transform_spending_df(df, spending_range, growth_range):
@@ -20,7 +28,9 @@ def transform_spending_df(df, spending_range, growth_range):
                 df["Year"].isin(list(range(spending_range[0], spending_range[1] + 1))),
                 :,
             ]
-            .groupby(["Country"])["Government Expenditure (IMF, Wiki, Statistica)"]
+            .groupby(["Country"], observed=True)[
+                "Government Expenditure (IMF, Wiki, Statistica)"
+            ]
             .mean()
         )
         .reset_index()
@@ -36,115 +46,286 @@ def transform_spending_df(df, spending_range, growth_range):
     )
 
     # Fill NA values before calling pct_change using ffill()
-    df["GDP per capita (OWiD)"] = df.groupby("Country")["GDP per capita (OWiD)"].ffill()
-
-    df[growth_col] = df.groupby(["Country"])["GDP per capita (OWiD)"].pct_change(
-        periods=(growth_range[1] - growth_range[0]), fill_method=None
-    ) * (100 / (growth_range[1] - growth_range[0]))
+    df["GDP per capita (OWiD)"] = df.groupby("Country", observed=True)[
+        "GDP per capita (OWiD)"
+    ].ffill()
+
+    df[growth_col] = df.groupby(["Country"], observed=True)[
+        "GDP per capita (OWiD)"
+    ].pct_change(periods=(growth_range[1] - growth_range[0]), fill_method=None) * (
+        100 / (growth_range[1] - growth_range[0])
+    )
 
     ### Filter to most recent growth range year
     df = df.loc[df["Year"] == growth_range[1]]
     return df, spend_col, growth_col
 
 
-def get_scatter_df(df, long_range, sub_period):
+def get_scatter_df(df, long_range, sub_period, growth_metric="average"):
+    return get_all_windows_scatter_df(df, long_range, sub_period, growth_metric)
+
+
+def get_all_windows_scatter_df(df, long_range, sub_period, growth_metric="average"):
+    """Spend vs growth for every (country, start_year, end_year) window in one pass.
+
+    Gives the same rows as calling transform_spending_df once per window, but
+    the average spend comes from per-country cumulative sums and the annualized
+    growth from a GDP array shifted by sub_period rows within each country.
+    growth_metric "average" is the total change divided by sub_period (as in
+    transform_spending_df), "annualized" the compound annual rate.
+    """
     x_title_no_brackets = "Average Government Expenditure as % of GDP"
     y_title_no_brackets = "Annualized percentage change in GDP per capita USD"
-    all_subperiod_df_list = []
-    nPeriods = long_range[1] - (long_range[0] + sub_period) + 1
-    for p in range(nPeriods):
-        sg_range = (long_range[0] + p, long_range[0] + p + sub_period)
-        subperiod_df, spend_col, growth_col = transform_spending_df(
-            df=df, spending_range=sg_range, growth_range=sg_range
-        )
-        subperiod_df = subperiod_df.loc[
-            :, ["Country", "Region", "Population", spend_col, growth_col]
-        ].rename(
-            columns={
-                spend_col: x_title_no_brackets,
-                growth_col: y_title_no_brackets,
-            }
+    gdp_col = "GDP per capita (OWiD)"
+    spend_col = "Government Expenditure (IMF, Wiki, Statistica)"
+
+    panel = (
+        df.loc[
+            df["Country"].notna(),
+            ["Country", "Region", "Population", "Year", gdp_col, spend_col],
+        ]
+        .sort_values(["Country", "Year"], kind="stable")
+        .reset_index(drop=True)
+    )
+    country_codes = pd.factorize(panel["Country"])[0]
+    years = panel["Year"].to_numpy(dtype=np.int64)
+    n_rows = len(panel)
+
+    ### First row of each country, broadcast back to every row
+    group_starts = np.r_[0, np.flatnonzero(np.diff(country_codes)) + 1]
+    row_group_start = group_starts[country_codes]
+
+    year_min = years.min() if n_rows else 0
+    stride = (years.max() - year_min if n_rows else 0) + sub_period + 1
+    keys = country_codes.astype(np.int64) * stride + (years - year_min)
+
+    ### Growth: "average" compares forward filled GDP with the value sub_period
+    ### rows back, "annualized" compounds between the (first) rows of the exact
+    ### start and end years
+    growth = np.full(n_rows, np.nan)
+    if growth_metric == "annualized":
+        gdp = panel[gdp_col].to_numpy(dtype=float)
+        rows = np.searchsorted(keys, keys)
+        prev_rows = np.searchsorted(keys, keys - sub_period)
+        has_prev = prev_rows < n_rows
+        has_prev[has_prev] = keys[prev_rows[has_prev]] == keys[has_prev] - sub_period
+    else:
+        gdp = panel.groupby("Country", sort=False, observed=True)[gdp_col].ffill()
+        gdp = gdp.to_numpy(dtype=float)
+        rows = np.arange(n_rows)
+        prev_rows = rows - sub_period
+        has_prev = prev_rows >= row_group_start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = gdp[rows[has_prev]] / gdp[prev_rows[has_prev]]
+        if growth_metric == "annualized":
+            growth[has_prev] = (ratio ** (1 / sub_period) - 1) * 100
+        else:
+            growth[has_prev] = (ratio - 1) * (100 / sub_period)
+
+    ### Average spend over [end_year - sub_period, end_year] from cumulative sums
+    spend = panel[spend_col].to_numpy(dtype=float)
+    spend_present = ~np.isnan(spend)
+    spend_cumsum = np.r_[0.0, np.cumsum(np.where(spend_present, spend, 0.0))]
+    count_cumsum = np.r_[0, np.cumsum(spend_present)]
+    lower = np.searchsorted(keys, keys - sub_period, side="left")
+    upper = np.searchsorted(keys, keys, side="right")
+    counts = count_cumsum[upper] - count_cumsum[lower]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average_spend = np.where(
+            counts > 0, (spend_cumsum[upper] - spend_cumsum[lower]) / counts, np.nan
         )
-        subperiod_df["start_year"] = sg_range[0]
-        subperiod_df["end_year"] = sg_range[1]
-        all_subperiod_df_list.append(subperiod_df)
-    all_subperiod_df = pd.concat(all_subperiod_df_list).reset_index(drop=True)
+
+    ### Keep rows that close a window inside long_range
+    in_range = (years >= long_range[0] + sub_period) & (years <= long_range[1])
+    all_subperiod_df = panel.loc[in_range, ["Country", "Region", "Population"]]
+    all_subperiod_df[x_title_no_brackets] = average_spend[in_range]
+    all_subperiod_df[y_title_no_brackets] = growth[in_range]
+    all_subperiod_df["start_year"] = years[in_range] - sub_period
+    all_subperiod_df["end_year"] = years[in_range]
+    all_subperiod_df = all_subperiod_df.sort_values(
+        ["end_year", "Country"], kind="stable"
+    ).reset_index(drop=True)
     return all_subperiod_df
 
 
-def make_region_avg_df(spending_df, weight_pop):
-    if weight_pop:
-        wm = lambda x: np.average(x, weights=spending_df.loc[x.index, "Population"])
-        region_avg_spending_df = (
-            spending_df.groupby(["Region", "Year"])
-            .agg(
-                **{
-                    "Population": ("Population", "sum"),
-                    "GDP per capita (OWiD)": ("GDP per capita (OWiD)", wm),
-                    "Government Expenditure (IMF, Wiki, Statistica)": (
-                        "Government Expenditure (IMF, Wiki, Statistica)",
-                        wm,
-                    ),
-                }
+class WindowIndex(object):
+    """Dense (start_year, end_year) -> (x, y, centroid_x, centroid_y) lookup.
+
+    Rows are stored in a NumPy array offset by the first start year, so a
+    lookup is an integer subtraction and a row read instead of two boolean
+    masks over the scatter DataFrame. The first row for each start year wins,
+    as with the old DataFrame filter.
+    """
+
+    col_names = [
+        "Average Government Expenditure as % of GDP",
+        "Annualized percentage change in GDP per capita USD",
+        "centroid_x",
+        "centroid_y",
+    ]
+
+    def __init__(self, scatter_df, sub_period=5):
+        self.sub_period = sub_period
+        start_years = scatter_df["start_year"].to_numpy(dtype=np.int64)
+        end_years = scatter_df["end_year"].to_numpy(dtype=np.int64)
+        in_window = end_years - start_years == sub_period
+        start_years = start_years[in_window]
+        values = scatter_df.reindex(columns=self.col_names).to_numpy(dtype=float)
+        values = values[in_window]
+
+        if len(start_years):
+            self.first_start_year = int(start_years.min())
+            n_years = int(start_years.max()) - self.first_start_year + 1
+        else:
+            self.first_start_year, n_years = 0, 0
+        self.coords = np.full((n_years, len(self.col_names)), np.nan)
+        self.present = np.zeros(n_years, dtype=bool)
+        unique_starts, first_rows = np.unique(start_years, return_index=True)
+        self.coords[unique_starts - self.first_start_year] = values[first_rows]
+        self.present[unique_starts - self.first_start_year] = True
+
+    def lookup(self, start_year, end_year, which_data=None):
+        if abs(end_year - start_year) != self.sub_period:
+            end_year = start_year + self.sub_period
+        i = int(start_year) - self.first_start_year
+        if i < 0 or i >= len(self.present) or not self.present[i]:
+            raise ValueError(
+                f"No data found for start_year={start_year} and end_year={end_year}"
             )
-            .reset_index()
-        )
+        if which_data == "centroid":
+            return self.coords[i, 2:]
+        return self.coords[i, :2]
+
+
+def make_region_avg_df(spending_df, weight_pop, levels=("Region",)):
+    """Yearly averages of GDP per capita and expenditure per group, named "<group>_avg".
+
+    levels can be any of "Subregion", "Region" and "World". Per-row sums
+    (value x population when weight_pop) are reduced once over the finest
+    level and rolled up to the coarser ones, so every level comes from a
+    single pass over the rows.
+    """
+    value_cols = [
+        "GDP per capita (OWiD)",
+        "Government Expenditure (IMF, Wiki, Statistica)",
+    ]
+    if "Subregion" in levels:
+        finest_keys = ["Region", "Subregion", "Year"]
+    elif "Region" in levels:
+        finest_keys = ["Region", "Year"]
     else:
-        region_avg_spending_df = (
-            spending_df.groupby(["Region", "Year"])
-            .agg(
-                {
-                    "Population": "sum",
-                    "GDP per capita (OWiD)": "mean",
-                    "Government Expenditure (IMF, Wiki, Statistica)": "mean",
-                }
+        finest_keys = ["Year"]
+
+    # Additive per-row terms; a weighted mean is NaN if any value or weight is
+    weights = spending_df["Population"]
+    terms = {"Population": weights}
+    for col in value_cols:
+        if weight_pop:
+            terms[col + "_sum"] = spending_df[col] * weights
+            terms[col + "_weight"] = weights
+            terms[col + "_nans"] = spending_df[col].isna() | weights.isna()
+        else:
+            terms[col + "_sum"] = spending_df[col]
+            terms[col + "_weight"] = spending_df[col].notna()
+            terms[col + "_nans"] = pd.Series(False, index=spending_df.index)
+    finest_sums = (
+        pd.DataFrame(terms)
+        .astype({col + "_nans": int for col in value_cols})
+        .groupby([spending_df[key] for key in finest_keys], observed=True, dropna=False)
+        .sum()
+    )
+
+    level_dfs = []
+    for level in levels:
+        level_keys = {
+            "Subregion": ["Region", "Subregion", "Year"],
+            "Region": ["Region", "Year"],
+            "World": ["Year"],
+        }[level]
+        sums = finest_sums.groupby(level=level_keys, observed=True).sum()
+        level_df = sums[["Population"]].copy()
+        for col in value_cols:
+            level_df[col] = (sums[col + "_sum"] / sums[col + "_weight"]).mask(
+                sums[col + "_nans"] > 0
             )
-            .reset_index()
-        )
-    region_avg_spending_df["Country"] = region_avg_spending_df["Region"] + "_avg"
-    return region_avg_spending_df
+        level_df = level_df.reset_index()
+        if level == "World":
+            level_df.insert(0, "Region", "World")
+        name_col = "Region" if level == "World" else level
+        level_df["Country"] = level_df[name_col].astype(str) + "_avg"
+        level_dfs.append(level_df)
+
+    if len(level_dfs) == 1:
+        return level_dfs[0]
+    return pd.concat(level_dfs, ignore_index=True)
 
 
 def create_country_group(
     df, countries, new_country_name, new_region_name, weight_pop=True
 ):
-    # Filter the dataframe to include only the specified countries
-    filtered_df = df[df["Country"].isin(countries)]
-
-    # Find the overlapping years
-    overlapping_years = set.intersection(
-        *[
-            set(filtered_df[filtered_df["Country"] == country]["Year"])
-            for country in countries
-        ]
+    return create_country_groups(
+        df, [(countries, new_country_name, new_region_name)], weight_pop=weight_pop
     )
 
-    # Filter the dataframe to include only the overlapping years
-    filtered_df = filtered_df[filtered_df["Year"].isin(overlapping_years)]
 
-    # Group by Year
-    grouped = filtered_df.groupby("Year")
+def create_country_groups(df, groups, weight_pop=True):
+    """Append one aggregate country per (countries, new_country_name, new_region_name) in groups.
+
+    Each aggregate covers the years in which all of its countries have data,
+    with GDP per capita and expenditure averaged (population weighted when
+    weight_pop) and population summed. All groups come from one groupby and
+    are appended to df in a single concat.
+    """
+    value_cols = [
+        "GDP per capita (OWiD)",
+        "Government Expenditure (IMF, Wiki, Statistica)",
+    ]
+
+    # One row per (group, member country), so a country can sit in several groups
+    membership = pd.DataFrame(
+        [
+            (group_idx, country)
+            for group_idx, (countries, _, _) in enumerate(groups)
+            for country in dict.fromkeys(countries)
+        ],
+        columns=["group_idx", "Country"],
+    )
+    n_members = membership.groupby("group_idx").size()
+    members_df = df.loc[
+        df["Country"].isin(membership["Country"]),
+        ["Country", "Year", "Population"] + value_cols,
+    ]
+    members_df = members_df.astype({"Country": object}).merge(membership, on="Country")
+
+    # Keep only the years in which every member of the group has data
+    countries_per_year = members_df.groupby(["group_idx", "Year"])["Country"].transform(
+        "nunique"
+    )
+    members_df = members_df.loc[
+        countries_per_year == members_df["group_idx"].map(n_members)
+    ]
 
     # Calculate means based on pop_weight flag
+    grouped_keys = [members_df["group_idx"], members_df["Year"]]
     if weight_pop:
-        # Weighted mean
-        means = grouped.apply(
-            lambda x: pd.Series(
-                {
-                    "GDP per capita (OWiD)": np.average(
-                        x["GDP per capita (OWiD)"], weights=x["Population"]
-                    ),
-                    "Government Expenditure (IMF, Wiki, Statistica)": np.average(
-                        x["Government Expenditure (IMF, Wiki, Statistica)"],
-                        weights=x["Population"],
-                    ),
-                    "Population": x["Population"].sum(),
-                }
-            )
+        # Weighted mean, NaN if any value or weight in the year is NaN
+        weights = members_df["Population"]
+        means = members_df[value_cols].mul(weights, axis=0).groupby(grouped_keys).sum()
+        means = means.div(weights.groupby(grouped_keys).sum(), axis=0)
+        is_nan = (
+            members_df[value_cols].isna().to_numpy()
+            | weights.isna().to_numpy()[:, np.newaxis]
         )
+        has_nan = (
+            pd.DataFrame(is_nan, columns=value_cols, index=members_df.index)
+            .groupby(grouped_keys)
+            .any()
+        )
+        means = means.mask(has_nan).astype(float)
+        means["Population"] = weights.groupby(grouped_keys).sum().astype(float)
     else:
         # Unweighted mean
-        means = grouped.agg(
+        means = members_df.groupby(["group_idx", "Year"]).agg(
             {
                 "GDP per capita (OWiD)": "mean",
                 "Government Expenditure (IMF, Wiki, Statistica)": "mean",
@@ -152,12 +333,12 @@ def create_country_group(
             }
         )
 
-    # Reset index to make Year a column
+    # Reset index to make group_idx and Year columns
     means = means.reset_index()
 
     # Add new country information
-    means["Country"] = new_country_name
-    means["Region"] = new_region_name
+    means["Country"] = [groups[i][1] for i in means["group_idx"]]
+    means["Region"] = [groups[i][2] for i in means["group_idx"]]
 
     # Ensure the new dataframe has the same columns as the original
     for col in df.columns:
@@ -174,85 +355,124 @@ def create_country_group(
 
 
 def add_binned_columns(scatter_df, bin_groups, filter_start_years=None):
-    binned_data = []
-    for (country, region), country_data in scatter_df.groupby(["Country", "Region"]):
-        if filter_start_years:
-            gdp_col = "av_gdp_change_mp_filtered"
-        else:
-            gdp_col = "av_gdp_change_mp"
-
-        country_data["av_gov_exp_mp"] = np.nan
-        country_data[gdp_col] = np.nan
-        for mid_point, [lower, upper] in bin_groups.items():
-            country_data["av_gov_exp_mp"] = np.where(
-                country_data["Average Government Expenditure as % of GDP"].between(
-                    lower, upper, inclusive="left"
-                ),
-                mid_point,
-                country_data["av_gov_exp_mp"],
-            )
+    """Spending bin mid point per row, and the mean growth of its (Country, Region, bin).
+
+    Bins are [lower, upper) intervals and must not overlap; rows whose
+    start_year is in filter_start_years are left out of the means. Rows come
+    back grouped by Country and Region, as before.
+    """
+    if filter_start_years:
+        gdp_col = "av_gdp_change_mp_filtered"
+    else:
+        gdp_col = "av_gdp_change_mp"
+
+    ### Order rows by (Country, Region) group, dropping rows without one
+    group_ids = scatter_df.groupby(["Country", "Region"], observed=True).ngroup()
+    group_ids = group_ids.to_numpy()
+    order = np.argsort(group_ids, kind="stable")
+    order = order[group_ids[order] >= 0]
+    binned_df = scatter_df.iloc[order].copy()
+    group_ids = group_ids[order]
+
+    ### Assign every row its bin in one pass
+    sorted_bins = sorted(bin_groups.items(), key=lambda item: item[1][0])
+    mid_points = np.array([mid_point for mid_point, _ in sorted_bins], dtype=float)
+    intervals = pd.IntervalIndex.from_tuples(
+        [tuple(bounds) for _, bounds in sorted_bins], closed="left"
+    )
+    bin_codes = pd.cut(
+        binned_df["Average Government Expenditure as % of GDP"], intervals
+    ).cat.codes.to_numpy()
+    in_bin = bin_codes >= 0
+    binned_df["av_gov_exp_mp"] = np.where(in_bin, mid_points[bin_codes], np.nan)
+
+    ### One grouped mean over (group, bin), excluding the filtered start years
+    growth = binned_df["Annualized percentage change in GDP per capita USD"]
+    if filter_start_years:
+        growth = growth.where(~binned_df["start_year"].isin(filter_start_years))
+    bin_means = growth.groupby([group_ids, bin_codes]).transform("mean")
+    binned_df[gdp_col] = bin_means.where(in_bin)
+    return binned_df
 
-            if filter_start_years:
-                filter_cond = (country_data["av_gov_exp_mp"] == mid_point) & (
-                    ~country_data["start_year"].isin(filter_start_years)
-                )
-            else:
-                filter_cond = country_data["av_gov_exp_mp"] == mid_point
-
-            country_data[gdp_col] = np.where(
-                country_data["av_gov_exp_mp"] == mid_point,
-                country_data.loc[
-                    filter_cond,
-                    "Annualized percentage change in GDP per capita USD",
-                ].mean(),
-                country_data[gdp_col],
-            )
 
-        binned_data.append(country_data)
+def fit_kmeans(X, n_clusters, mode="full", init_centers=None):
+    """Labels and per-row centroids of one group's points.
 
-    # Create the binned dataframe using pd.DataFrame constructor
-    binned_df = pd.concat(binned_data)
-    return binned_df
+    mode "full" is a plain KMeans, "warm" starts from init_centers with a
+    single init, and "minibatch" uses MiniBatchKMeans.
+    """
+    n_clusters = min(n_clusters, len(X))
+    if mode == "minibatch":
+        k_means = MiniBatchKMeans(n_clusters=n_clusters, random_state=37, n_init=3)
+    elif (
+        mode == "warm" and init_centers is not None and len(init_centers) == n_clusters
+    ):
+        k_means = KMeans(n_clusters=n_clusters, init=init_centers, n_init=1)
+    else:
+        k_means = KMeans(n_clusters=n_clusters, random_state=37)
+    labels = k_means.fit_predict(X)
+    return labels, k_means.cluster_centers_[labels]
 
 
-def add_kmeans_clusters(scatter_df, n_clusters):
-    def cluster(X, n_clusters):
-        k_means = KMeans(n_clusters=n_clusters, random_state=37)
-        y = k_means.fit_predict(X)
-        return y, k_means
-
-    all_country_data = []
-    for (country, region), country_data in scatter_df.groupby(["Country", "Region"]):
-        if country != "G7":
-            continue
-
-        country_data = country_data.dropna(
-            subset=[
-                "Average Government Expenditure as % of GDP",
-                "Annualized percentage change in GDP per capita USD",
-            ]
-        )
-        arr = np.array(
-            country_data.loc[
-                :,
-                [
-                    "Average Government Expenditure as % of GDP",
-                    "Annualized percentage change in GDP per capita USD",
-                ],
-            ]
+def add_kmeans_clusters(
+    scatter_df, n_clusters, countries=("G7",), mode="full", n_jobs=-1, use_cache=True
+):
+    """Cluster each country's (spend, growth) windows, adding Cluster, centroid_x and centroid_y.
+
+    countries=None clusters every country. Groups are fitted in parallel
+    across n_jobs workers; mode "warm" seeds each group with the centroids
+    of one pooled fit and "minibatch" uses MiniBatchKMeans (see fit_kmeans).
+    Results are cached in data/.cache, keyed on the input rows and settings.
+    """
+    if countries is not None:
+        scatter_df = scatter_df.loc[scatter_df["Country"].isin(countries), :]
+    group_data = [
+        country_data.dropna(subset=KMEANS_COLUMNS)
+        for _, country_data in scatter_df.groupby(["Country", "Region"], observed=True)
+    ]
+    group_data = [country_data for country_data in group_data if len(country_data)]
+    if not group_data:
+        return scatter_df.iloc[:0].assign(Cluster=[], centroid_x=[], centroid_y=[])
+    clustered_df = pd.concat(group_data)
+
+    def build():
+        arrays = [
+            country_data[KMEANS_COLUMNS].to_numpy() for country_data in group_data
+        ]
+        init_centers = None
+        if mode == "warm":
+            init_centers = (
+                KMeans(n_clusters=n_clusters, random_state=37)
+                .fit(np.concatenate(arrays))
+                .cluster_centers_
+            )
+        if n_jobs == 1 or len(arrays) == 1:
+            results = [fit_kmeans(X, n_clusters, mode, init_centers) for X in arrays]
+        else:
+            results = Parallel(n_jobs=n_jobs)(
+                delayed(fit_kmeans)(X, n_clusters, mode, init_centers) for X in arrays
+            )
+        centroids = np.concatenate([result[1] for result in results])
+        return pd.DataFrame(
+            {
+                "Cluster": np.concatenate([result[0] for result in results]),
+                "centroid_x": centroids[:, 0],
+                "centroid_y": centroids[:, 1],
+            }
         )
-        culster_result = cluster(arr, n_clusters)[1]
-        country_data.loc[:, "Cluster"] = culster_result.labels_
-        country_data.loc[:, "centroid_x"] = culster_result.cluster_centers_[
-            culster_result.labels_
-        ][:, 0]
-        country_data.loc[:, "centroid_y"] = culster_result.cluster_centers_[
-            culster_result.labels_
-        ][:, 1]
-        all_country_data.append(country_data)
-
-    clustered_df = pd.concat(all_country_data)
 
+    key = {
+        "data": frame_sha256(clustered_df[["Country", "Region"] + KMEANS_COLUMNS]),
+        "n_clusters": n_clusters,
+        "mode": mode,
+    }
+    if use_cache:
+        cache_dir = os.path.join(os.getcwd(), "data", CACHE_DIR_NAME)
+        clusters = read_memoized("kmeans", key, cache_dir, build)
+    else:
+        clusters = build()
+    for col in clusters.columns:
+        clustered_df[col] = clusters[col].to_numpy()
     return clustered_df
 
 